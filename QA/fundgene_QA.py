@@ -2,27 +2,15 @@ import asyncio
 import os
 from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
 from autogen_agentchat.teams import Swarm, RoundRobinGroupChat, SelectorGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.messages import HandoffMessage
 from autogen_agentchat.conditions import HandoffTermination, MaxMessageTermination, TextMentionTermination
 from autogen_agentchat.ui import Console
 from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
 from autogen_ext.agents.web_surfer import MultimodalWebSurfer
 from utils.Console_with_history import *
+from utils.model_client import get_model_client
 
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY") 
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+model_client = get_model_client()
 
 # QWEN_API_KEY = os.environ.get("QWEN_API_KEY")
 
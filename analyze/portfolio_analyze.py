@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import json
 import os
@@ -15,30 +16,18 @@ from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import TextMentionTermination
 from autogen_agentchat.ui import Console
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_ext.tools.mcp import McpWorkbench, StdioServerParams
 from autogen_agentchat.tools import AgentTool
-from portfolio_records import portfolio_records
-
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY") 
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+from portfolio_records import portfolio_records, get_repository
+from portfolio_metrics import calculate_portfolio_metrics
+from utils.system_file import atomic_write
+from utils.model_client import get_model_client, get_model_metrics
+
+model_client = get_model_client(cache=True)
 
 async def portfolio_analyze(userid : str) -> str:
     # records_get_tool = asyncio.run(portfolio_records())
 
-    task = f"获取user_id='{userid}'的投资记录"
-
     records = await portfolio_records(userid)
 
     print(f"成功获取投资记录数据\n投资记录数据如下：\n{records}\n")
@@ -156,7 +145,97 @@ async def portfolio_analyze(userid : str) -> str:
 
     return analyze_result
 
+ADVICE_SYSTEM_MESSAGE = """你是一位金融投资顾问，负责根据用户信息和已经计算好的资产配置、投资表现给出投资建议。
+        资产配置比例和投资表现均已计算完成，不要重新计算或修改这些数据。
+        只返回JSON对象，不要包含其他内容：
+        {
+            "总体建议": "根据用户的风险承受能力，建议适当调整资产配置。",
+            "具体操作": [
+                "增加股票投资比例至60%",
+                "减少现金持有比例至10%"
+            ],
+            "理由": "用户的风险承受能力较高，当前配置过于保守，无法充分利用市场机会。"
+        }
+        """
+
+
+def parse_advice(content: str) -> dict:
+    """从模型回复中解析建议JSON对象，解析失败时返回 {"error": ...}"""
+    start, end = content.find("{"), content.rfind("}")
+    if start == -1 or end <= start:
+        return {"error": "模型未返回JSON"}
+    try:
+        return json.loads(content[start:end + 1])
+    except json.JSONDecodeError as e:
+        return {"error": f"JSON解析错误: {str(e)}"}
+
+
+async def portfolio_advice(user_info: dict, analysis: dict, semaphore: asyncio.Semaphore) -> dict:
+    """在并发限制下调用模型，根据计算好的指标生成单个用户的建议部分"""
+    advice_agent = AssistantAgent(
+        name="PortfolioAdviceAgent",
+        model_client=model_client,
+        system_message=ADVICE_SYSTEM_MESSAGE,
+    )
+    task = json.dumps({"user_info": user_info, **analysis}, ensure_ascii=False)
+    async with semaphore:
+        result = await advice_agent.run(task=task)
+    return parse_advice(result.messages[-1].content)
+
+
+async def portfolio_analyze_batch(user_ids: list = None, concurrency: int = 8) -> dict:
+    """
+    批量分析用户的投资组合
+
+    一次查询读取所有用户的投资记录，在本地向量化计算资产配置比例和投资表现，
+    只有"建议"部分调用模型，各用户的模型调用并发执行
+
+    参数:
+        user_ids (list, optional): 要分析的用户ID，默认分析全部用户
+        concurrency (int): 同时进行的模型调用数量上限
+
+    返回:
+        dict: {user_id: {"资产配置比例", "投资表现", "建议"}}，没有投资记录的用户为 {"error": ...}
+    """
+    repository = get_repository()
+    frame = await asyncio.to_thread(repository.all_records_frame, user_ids)
+    results = calculate_portfolio_metrics(frame)
+    print(f"已计算 {len(results)} 个用户的投资组合指标")
+
+    user_infos = (
+        frame.drop_duplicates("user_id")
+        .set_index("user_id")[["username", "risk_tolerance", "investment_goal", "investment_preference"]]
+        .to_dict("index")
+    )
+    pending = [user_id for user_id, analysis in results.items() if "error" not in analysis]
+
+    semaphore = asyncio.Semaphore(concurrency)
+    advices = await asyncio.gather(
+        *(portfolio_advice({"user_id": user_id, **user_infos[user_id]}, results[user_id], semaphore) for user_id in pending),
+        return_exceptions=True,
+    )
+    for user_id, advice in zip(pending, advices):
+        if isinstance(advice, Exception):
+            advice = {"error": f"生成建议失败: {str(advice)}"}
+        results[user_id]["建议"] = advice
+
+    print(f"已生成 {len(pending)} 个用户的投资建议")
+    print(f"模型调用统计: {json.dumps(get_model_metrics(), ensure_ascii=False)}")
+    return results
+
+
 if __name__ == "__main__":
-    userid = "8c5373a6-f437-41ee-9830-284399af9893"
-    analyze_result = asyncio.run(portfolio_analyze(userid))
-    print(analyze_result)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="分析用户投资组合")
+    parser.add_argument("--user", default="8c5373a6-f437-41ee-9830-284399af9893", help="分析单个用户")
+    parser.add_argument("--all", action="store_true", help="批量分析全部用户")
+    parser.add_argument("--concurrency", type=int, default=8, help="批量分析时模型调用的并发数")
+    parser.add_argument("--output", default="portfolio_analysis.json", help="批量分析结果的输出文件")
+    args = parser.parse_args()
+
+    if args.all:
+        results = asyncio.run(portfolio_analyze_batch(concurrency=args.concurrency))
+        atomic_write(args.output, json.dumps(results, ensure_ascii=False, indent=4).encode("utf-8"))
+        print(f"分析结果已保存到 {args.output}")
+    else:
+        analyze_result = asyncio.run(portfolio_analyze(args.user))
+        print(analyze_result)
@@ -0,0 +1,127 @@
+import datetime
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+# 基金类型到资产类型的映射，与 calculate_portfolio_analysis 一致
+FUND_TYPE_TO_ASSET = {
+    "股票型": "股票",
+    "混合型": "股票",
+    "指数型": "股票",
+    "QDII": "其他",
+    "债券型": "债券",
+    "货币市场型": "现金",
+    "ETF": "股票",
+}
+
+# 风险等级映射
+RISK_LEVEL_MAP = {
+    "低": "低风险",
+    "中低": "低风险",
+    "中": "中风险",
+    "中高": "中风险",
+    "高": "高风险",
+}
+
+ASSET_TYPES = ["股票", "债券", "现金", "其他"]
+RISK_GROUPS = ["低风险", "中风险", "高风险"]
+
+
+def _percentages(values: pd.Series, totals: pd.Series) -> pd.Series:
+    """按 (user_id, 分类) 汇总的金额换算为占该用户总资产的整数百分比"""
+    user_totals = totals.reindex(values.index.get_level_values("user_id")).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = np.round(100 * values.to_numpy() / user_totals)
+    return pd.Series(percentages, index=values.index)
+
+
+def _category_dicts(percentages: pd.Series) -> dict:
+    """将 (user_id, 分类) 占比转换为 {user_id: {分类: 百分比}}，保持分类首次出现的顺序"""
+    result = defaultdict(dict)
+    for (user_id, key), value in percentages.items():
+        result[user_id][key] = int(value)
+    return result
+
+
+def _with_defaults(categories: dict, defaults: list) -> dict:
+    """补齐没有持仓的标准分类"""
+    categories = dict(categories)
+    for key in defaults:
+        categories.setdefault(key, 0)
+    return categories
+
+
+def calculate_portfolio_metrics(frame: pd.DataFrame, now: datetime.datetime = None) -> dict:
+    """
+    批量计算所有用户的资产配置比例和投资表现，计算口径与 calculate_portfolio_analysis 相同
+
+    参数:
+        frame (pd.DataFrame): PortfolioRepository.all_records_frame() 的结果，每行一条交易
+        now (datetime, optional): 计算持有天数的基准时间，默认为当前时间
+
+    返回:
+        dict: {user_id: {"资产配置比例": {...}, "投资表现": {...}}}，
+              没有投资记录的用户为 {"error": "未找到投资记录"}
+    """
+    now = now or datetime.datetime.now()
+    user_ids = frame["user_id"].drop_duplicates().tolist()
+
+    records = frame[frame["behavior_id"].notna()].copy()
+    records["current_value"] = records["current_nav"].fillna(0).astype(float) * records["fund_shares"].fillna(0).astype(float)
+    records["amount"] = records["amount"].fillna(0).astype(float)
+    records["asset_type"] = records["fund_type"].map(FUND_TYPE_TO_ASSET).fillna("其他")
+    records["risk_group"] = records["risk_level"].map(RISK_LEVEL_MAP).fillna("中风险")
+    records["platform"] = records["platform"].fillna("未知平台")
+    records["trade_time"] = pd.to_datetime(records["timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+
+    grouped = records.groupby("user_id", sort=False)
+    totals = grouped.agg(
+        total_value=("current_value", "sum"),
+        total_amount=("amount", "sum"),
+        earliest=("trade_time", "min"),
+    )
+    total_value = totals["total_value"]
+
+    # 各分类金额占比，总资产为0的用户不计算占比
+    positive = total_value[total_value > 0]
+    by_asset = _percentages(records.groupby(["user_id", "asset_type"], sort=False)["current_value"].sum(), positive).dropna()
+    by_risk = _percentages(records.groupby(["user_id", "risk_group"], sort=False)["current_value"].sum(), positive).dropna()
+    by_platform = _percentages(records.groupby(["user_id", "platform"], sort=False)["current_value"].sum(), positive).dropna()
+    asset_dicts, risk_dicts, platform_dicts = _category_dicts(by_asset), _category_dicts(by_risk), _category_dicts(by_platform)
+
+    # 持有天数从最早一笔交易算起，至少为1天
+    earliest = totals["earliest"].fillna(pd.Timestamp(now))
+    days_invested = np.maximum(1, (pd.Timestamp(now) - earliest).dt.days)
+
+    total_amount = totals["total_amount"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_return = np.where(total_amount > 0, (total_value / total_amount - 1) * 100, 0.0)
+    total_return = pd.Series(total_return, index=totals.index)
+    annualized_return = total_return * (365 / days_invested)
+
+    # 波动率使用与风险分布对应的估算值
+    risk_table = by_risk.unstack("risk_group").reindex(index=totals.index, columns=RISK_GROUPS).fillna(0)
+    high_risk, low_risk = risk_table["高风险"], risk_table["低风险"]
+    volatility = pd.Series(np.select([high_risk > 50, low_risk > 50], [18.5, 5.8], default=12.3), index=totals.index)
+
+    has_records = set(totals.index)
+    results = {}
+    for user_id in user_ids:
+        if user_id not in has_records:
+            results[user_id] = {"error": "未找到投资记录"}
+            continue
+
+        results[user_id] = {
+            "资产配置比例": {
+                "按资产类型": _with_defaults(asset_dicts[user_id], ASSET_TYPES),
+                "按风险等级": _with_defaults(risk_dicts[user_id], RISK_GROUPS),
+                "按投资平台": platform_dicts[user_id],
+                "总资产价值": round(float(total_value[user_id]), 2),
+            },
+            "投资表现": {
+                "总收益率": round(float(total_return[user_id]), 1),
+                "年化收益率": round(float(annualized_return[user_id]), 1),
+                "波动率": round(float(volatility[user_id]), 1),
+            },
+        }
+    return results
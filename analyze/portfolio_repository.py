@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import pathlib
+import threading
+import pandas as pd
+from typing import List, Optional, TypedDict
+
+# 基金投资行为数据库
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "behavior", "fund_investment.db")
+
+
+class UserInfo(TypedDict):
+    user_id: str
+    username: str
+    risk_tolerance: Optional[str]
+    investment_goal: Optional[str]
+    investment_preference: Optional[str]
+
+
+class FundInfo(TypedDict):
+    fund_id: str
+    fund_name: Optional[str]
+    fund_code: Optional[str]
+    fund_type: Optional[str]
+    risk_level: Optional[str]
+    current_nav: Optional[float]
+
+
+class TransactionInfo(TypedDict):
+    action_type: str
+    amount: Optional[float]
+    timestamp: Optional[str]
+    nav_price: Optional[float]
+    fund_shares: Optional[float]
+    platform: Optional[str]
+    transaction_status: Optional[str]
+
+
+class InvestmentRecord(TypedDict):
+    behavior_id: str
+    fund_info: FundInfo
+    transaction_info: TransactionInfo
+
+
+class PortfolioRecords(TypedDict):
+    user_info: UserInfo
+    investment_records: List[InvestmentRecord]
+
+
+USER_FIELDS = ("user_id", "username", "risk_tolerance", "investment_goal", "investment_preference")
+FUND_FIELDS = ("fund_id", "fund_name", "fund_code", "fund_type", "risk_level", "current_nav")
+TRANSACTION_FIELDS = ("action_type", "amount", "timestamp", "nav_price", "fund_shares", "platform", "transaction_status")
+
+# 用户信息与投资记录的联表查询，没有投资记录的用户也会返回一行用户信息
+RECORDS_SELECT = """
+    SELECT
+        u.user_id, u.username, u.risk_tolerance, u.investment_goal, u.investment_preference,
+        b.behavior_id,
+        b.fund_id, f.fund_name, f.fund_code, f.fund_type, f.risk_level, f.current_nav,
+        b.action_type, b.amount, b.timestamp, b.nav_price, b.fund_shares, b.platform, b.transaction_status
+    FROM users u
+    LEFT JOIN investment_behaviors b ON b.user_id = u.user_id
+    LEFT JOIN funds f ON f.fund_id = b.fund_id
+"""
+# 单个用户
+RECORDS_SQL = RECORDS_SELECT + "WHERE u.user_id = ? ORDER BY b.timestamp, b.behavior_id"
+# 全部用户，一次扫描 investment_behaviors
+ALL_RECORDS_SQL = RECORDS_SELECT + "ORDER BY u.user_id, b.timestamp, b.behavior_id"
+
+
+def _user_info(row: sqlite3.Row) -> UserInfo:
+    return {field: row[field] for field in USER_FIELDS}
+
+
+def _investment_record(row: sqlite3.Row) -> InvestmentRecord:
+    return {
+        "behavior_id": row["behavior_id"],
+        "fund_info": {field: row[field] for field in FUND_FIELDS},
+        "transaction_info": {field: row[field] for field in TRANSACTION_FIELDS},
+    }
+
+
+class PortfolioRepository:
+    def __init__(self, db_path: str = DB_PATH):
+        """
+        用户投资记录的只读数据访问层
+
+        使用一个长连接执行参数化的联表查询，sqlite3会缓存预编译语句，
+        多次查询不需要重复解析SQL；连接可在线程间共享（asyncio.to_thread）
+
+        参数:
+            db_path (str): fund_investment.db 的路径
+        """
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if not os.path.exists(self.db_path):
+                raise FileNotFoundError(f"数据库文件不存在: {self.db_path}")
+            uri = pathlib.Path(self.db_path).resolve().as_uri() + "?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def get_portfolio_records(self, user_id: str) -> Optional[PortfolioRecords]:
+        """
+        查询用户信息及其全部投资记录，记录按交易时间排序
+
+        返回:
+            PortfolioRecords: {"user_info": {...}, "investment_records": [...]}，用户不存在时返回None
+        """
+        with self._lock:
+            rows = self._connect().execute(RECORDS_SQL, (user_id,)).fetchall()
+        if not rows:
+            return None
+
+        return {
+            "user_info": _user_info(rows[0]),
+            "investment_records": [_investment_record(row) for row in rows if row["behavior_id"] is not None],
+        }
+
+    def all_records_frame(self, user_ids: list = None) -> pd.DataFrame:
+        """
+        一次查询读取全部用户的投资记录，每行一条交易，列与 RECORDS_SQL 相同
+
+        没有投资记录的用户保留一行，behavior_id 为空
+
+        参数:
+            user_ids (list, optional): 只保留这些用户，默认全部用户
+        """
+        with self._lock:
+            frame = pd.read_sql_query(ALL_RECORDS_SQL, self._connect())
+        if user_ids is not None:
+            frame = frame[frame["user_id"].isin(user_ids)].reset_index(drop=True)
+        return frame
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
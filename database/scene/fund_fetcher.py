@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+并发基金历史净值抓取工具
+
+使用 asyncio + aiohttp 从天天基金 lsjz 接口并发抓取场景中所有基金的历史净值，
+直接写入场景数据库的 fund_nav 表。已完成的基金记录在 fetch_state 表中，
+中断后重新运行会跳过这些基金。
+
+用法：
+    python fund_fetcher.py 2020年疫情冲击 --start 2020-01-01 --end 2020-12-31
+    python fund_fetcher.py 2015年中国股灾 --start 2015-01-01 --end 2015-12-31 --csv "{code}_2015_history.csv"
+    python fund_fetcher.py 2020年疫情冲击 --funds 110022 161005 --concurrency 16 --rate 20
+"""
+
+import re
+import json
+import time
+import random
+import asyncio
+import sqlite3
+import argparse
+import datetime
+import aiohttp
+import pandas as pd
+from pathlib import Path
+from scene_builder import SCENE_ROOT, load_config, create_tables, clean_fund_nav, export_json_from_db
+
+# 天天基金历史净值接口
+LSJZ_URL = "http://api.fund.eastmoney.com/f10/lsjz"
+# 需要重试的HTTP状态码
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """单只基金重试后仍然抓取失败"""
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        令牌桶限速器
+
+        Args:
+            rate: 每秒补充的令牌数，即平均每秒请求数；为None或0时不限速
+            capacity: 桶容量，即允许的突发请求数，默认与rate相同
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1, rate or 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """取得一个令牌，令牌不足时等待"""
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def parse_lsjz(text):
+    """解析lsjz接口返回的JSONP或JSON文本"""
+    text = text.strip()
+    if not text.startswith('{'):
+        match = re.search(r'\((.*)\)', text, re.S)
+        if not match:
+            raise ValueError("无法解析接口返回内容")
+        text = match.group(1)
+    return json.loads(text)
+
+
+class FundHistoryFetcher:
+    def __init__(self, db_path, start_date, end_date, base_url=LSJZ_URL, concurrency=8, rate=10,
+                 page_size=200, retries=5, backoff=0.5, timeout=15):
+        """
+        基金历史净值并发抓取器
+
+        Args:
+            db_path: 场景数据库路径，抓取结果直接写入fund_nav表
+            start_date: 开始日期，例如 2020-01-01
+            end_date: 结束日期，例如 2020-12-31
+            base_url: lsjz接口地址，测试时可指向本地服务
+            concurrency: 同时进行的最大请求数（所有基金共享）
+            rate: 每秒最大请求数，为None或0时不限速
+            page_size: 每页条数
+            retries: 单个请求的最大重试次数
+            backoff: 重试的初始等待秒数，每次重试翻倍并加入随机抖动
+            timeout: 单个请求的超时秒数
+        """
+        self.db_path = Path(db_path)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate = rate
+        self.page_size = page_size
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.request_count = 0
+
+    async def _request_page(self, session, fund_code, page):
+        """请求一页数据，网络错误、限流和服务端错误时按指数退避重试"""
+        params = {
+            'fundCode': fund_code,
+            'pageIndex': page,
+            'pageSize': self.page_size,
+            'startDate': self.start_date,
+            'endDate': self.end_date,
+        }
+        headers = {
+            'User-Agent': 'Mozilla/5.0',
+            'Referer': f'http://fundf10.eastmoney.com/jjjz_{fund_code}.html'
+        }
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    await self._bucket.acquire()
+                    self.request_count += 1
+                    async with session.get(self.base_url, params=params, headers=headers) as response:
+                        if response.status in RETRY_STATUS:
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=response.status
+                            )
+                        response.raise_for_status()
+                        text = await response.text()
+                return parse_lsjz(text)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUS or attempt == self.retries:
+                    raise FetchError(f"基金 {fund_code} 第{page}页请求失败: HTTP {e.status}") from e
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                if attempt == self.retries:
+                    raise FetchError(f"基金 {fund_code} 第{page}页请求失败: {e!r}") from e
+            await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    async def fetch_fund(self, session, fund_code):
+        """
+        抓取单只基金在日期区间内的全部净值记录
+
+        先请求第一页得到总条数，再并发请求剩余页；接口实际返回的条数少于page_size时
+        按实际条数计算页数
+
+        Returns:
+            按接口顺序（日期倒序）排列的LSJZList记录列表
+
+        Raises:
+            FetchError: 请求重试后仍然失败，或接口返回的数据格式不正确
+        """
+        first = await self._request_page(session, fund_code, 1)
+        try:
+            records = (first.get('Data') or {}).get('LSJZList') or []
+            total = int(first.get('TotalCount') or 0)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise FetchError(f"基金 {fund_code} 第1页数据格式错误: {e!r}") from e
+        if not records or len(records) >= total:
+            return records
+
+        pages = -(-total // len(records))
+        results = await asyncio.gather(
+            *(self._request_page(session, fund_code, page) for page in range(2, pages + 1)),
+            return_exceptions=True
+        )
+        for page, result in enumerate(results, start=2):
+            if isinstance(result, BaseException):
+                raise result
+            try:
+                records.extend((result.get('Data') or {}).get('LSJZList') or [])
+            except (AttributeError, TypeError) as e:
+                raise FetchError(f"基金 {fund_code} 第{page}页数据格式错误: {e!r}") from e
+        return records
+
+    async def _fetch_with_code(self, session, fund_code):
+        """抓取单只基金，返回 (fund_code, records, error)，失败时records为None、error为错误信息"""
+        try:
+            return fund_code, await self.fetch_fund(session, fund_code), None
+        except FetchError as e:
+            return fund_code, None, str(e)
+        except Exception as e:
+            return fund_code, None, f"基金 {fund_code} 抓取失败: {e!r}"
+
+    def _connect(self):
+        """连接场景数据库并确保表结构存在"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        create_tables(cursor)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fetch_state (
+            fund_code TEXT,
+            start_date TEXT,
+            end_date TEXT,
+            row_count INTEGER,
+            fetched_at TEXT,
+            PRIMARY KEY (fund_code, start_date, end_date)
+        )
+        ''')
+        conn.commit()
+        return conn
+
+    def completed_funds(self, conn):
+        """获取当前日期区间内已抓取完成的基金代码"""
+        cursor = conn.execute(
+            "SELECT fund_code FROM fetch_state WHERE start_date = ? AND end_date = ?",
+            (self.start_date, self.end_date)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def _save(self, conn, fund_code, fund_name, records):
+        """在一个事务中写入基金净值和抓取检查点"""
+        rows = clean_fund_nav(fund_code, pd.DataFrame(records)) if records else []
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO funds (fund_code, fund_name) VALUES (?, ?)",
+                         (fund_code, fund_name))
+            conn.executemany('''
+            INSERT OR REPLACE INTO fund_nav
+            (fund_code, date, unit_nav, acc_nav, daily_growth, status_purchase, status_redeem)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.execute('''
+            INSERT OR REPLACE INTO fetch_state (fund_code, start_date, end_date, row_count, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (fund_code, self.start_date, self.end_date, len(rows),
+                  datetime.datetime.now().isoformat(timespec='seconds')))
+        return len(rows)
+
+    async def run(self, fund_codes, fund_names=None, resume=True, csv_dir=None, csv_name=None):
+        """
+        并发抓取多只基金并写入数据库
+
+        Args:
+            fund_codes: 基金代码列表
+            fund_names: 基金代码到名称的映射，用于写入funds表
+            resume: 是否跳过fetch_state中已完成的基金
+            csv_dir: 同时保存原始CSV的目录，为None时不保存
+            csv_name: CSV文件名模板，例如 {code}_2015_history.csv
+
+        Returns:
+            每只基金的结果 {fund_code: {'status', 'rows', 'message'}}，status为 fetched/skipped/error
+        """
+        fund_names = fund_names or {}
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._bucket = TokenBucket(self.rate)
+        conn = self._connect()
+        results = {}
+
+        try:
+            done = self.completed_funds(conn) if resume else set()
+            pending = [code for code in fund_codes if code not in done]
+            for code in fund_codes:
+                if code in done:
+                    results[code] = {'status': 'skipped', 'rows': 0, 'message': '已抓取'}
+
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+                tasks = [self._fetch_with_code(session, code) for code in pending]
+                # 每只基金完成后立即写入数据库，中断时已完成的基金不会丢失
+                # 单只基金抓取或保存失败只记录错误，不影响其他基金
+                for future in asyncio.as_completed(tasks):
+                    code, records, error = await future
+                    if error is None:
+                        try:
+                            if csv_dir is not None and records:
+                                pd.DataFrame(records).to_csv(
+                                    Path(csv_dir) / (csv_name or "{code}_history.csv").format(code=code),
+                                    index=False, encoding='utf-8-sig'
+                                )
+                            rows = self._save(conn, code, fund_names.get(code, code), records)
+                        except Exception as e:
+                            error = f"保存基金 {code} 的数据失败: {e!r}"
+                    if error is not None:
+                        print(error)
+                        results[code] = {'status': 'error', 'rows': 0, 'message': error}
+                        continue
+                    results[code] = {'status': 'fetched', 'rows': rows, 'message': ''}
+                    print(f"已抓取基金 {code} 的历史净值数据，共 {rows} 条")
+        finally:
+            conn.close()
+
+        return {code: results[code] for code in fund_codes if code in results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并发抓取场景基金的历史净值并写入场景数据库")
+    parser.add_argument('scene', help="场景目录名称，例如 2020年疫情冲击")
+    parser.add_argument('--start', required=True, help="开始日期，例如 2020-01-01")
+    parser.add_argument('--end', required=True, help="结束日期，例如 2020-12-31")
+    parser.add_argument('--root', type=str, default=str(SCENE_ROOT), help="场景根目录")
+    parser.add_argument('--funds', nargs='+', help="基金代码，默认使用场景配置中的所有基金")
+    parser.add_argument('--concurrency', type=int, default=8, help="最大并发请求数")
+    parser.add_argument('--rate', type=float, default=10, help="每秒最大请求数，0为不限速")
+    parser.add_argument('--page-size', type=int, default=200, help="每页条数")
+    parser.add_argument('--retries', type=int, default=5, help="单个请求的最大重试次数")
+    parser.add_argument('--url', type=str, default=LSJZ_URL, help="lsjz接口地址")
+    parser.add_argument('--csv', type=str, help="同时在场景目录保存CSV，参数为文件名模板，例如 {code}_history.csv")
+    parser.add_argument('--restart', action='store_true', help="忽略检查点，重新抓取所有基金")
+    args = parser.parse_args()
+
+    scene_dir = Path(args.root) / args.scene
+    config = load_config(scene_dir)
+    fund_codes = args.funds or list(config["funds"])
+    db_path = scene_dir / "converted" / config["db_name"]
+
+    fetcher = FundHistoryFetcher(
+        db_path, args.start, args.end, base_url=args.url, concurrency=args.concurrency,
+        rate=args.rate, page_size=args.page_size, retries=args.retries
+    )
+    started = time.perf_counter()
+    results = asyncio.run(fetcher.run(
+        fund_codes, fund_names=config["funds"], resume=not args.restart,
+        csv_dir=scene_dir if args.csv else None, csv_name=args.csv
+    ))
+
+    fetched = [code for code, result in results.items() if result['status'] == 'fetched']
+    failed = [code for code, result in results.items() if result['status'] == 'error']
+    print(f"抓取完成，用时 {time.perf_counter() - started:.2f}s，请求 {fetcher.request_count} 次，"
+          f"成功 {len(fetched)} 只，跳过 {len(results) - len(fetched) - len(failed)} 只，失败 {len(failed)} 只")
+
+    # 数据库有更新时重新导出JSON，模拟缓存会在下次加载时按数据库修改时间自动重建
+    if fetched:
+        export_json_from_db(db_path, scene_dir / "converted" / config["json_name"], indent=config["json_indent"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,610 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+统一的场景构建工具
+
+自动发现场景根目录下所有包含 场景配置.json 的场景目录，并行地将基金/指数CSV转换为：
+    converted/fund_crisis.db    SQLite数据库
+    converted/fund_crisis.json  JSON导出
+    converted/cache/            模拟系统使用的二进制行情缓存
+
+输入文件（CSV和场景配置）未变化的场景会被跳过；变化的场景按 ingest_state 表中记录的
+每个CSV文件的哈希和最大日期（高水位）只导入新增的数据行。
+
+场景配置.json 格式：
+{
+    "funds": {"000011": "华夏大盘精选", ...},
+    "indices": {"SH000001": {"name": "上证指数", "file": "上证指数历史数据 (1).csv"}},
+    "db_name": "fund_crisis.db",      (可选)
+    "json_name": "fund_crisis.json",  (可选，.jsonl 为JSON Lines格式，可加 .gz/.zst 压缩)
+    "json_indent": 2,                 (可选，null 为紧凑格式)
+    "cache": true                     (可选，是否生成模拟系统缓存)
+}
+
+用法：
+    python scene_builder.py                      构建 database/scene 下的所有场景
+    python scene_builder.py --scenes 2015年中国股灾
+    python scene_builder.py --root ../../recommend-agent --force
+    python scene_builder.py --full               重新导入所有CSV数据
+"""
+
+import os
+import io
+import re
+import sys
+import json
+import time
+import gzip
+import hashlib
+import sqlite3
+import argparse
+import contextlib
+import datetime
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SCENE_ROOT = Path(os.path.dirname(os.path.abspath(__file__)))
+SIMULATION_DIR = SCENE_ROOT.parent.parent / "scenario_simulation"
+
+# 场景配置文件名，存在该文件的目录被识别为场景
+CONFIG_NAME = "场景配置.json"
+# 构建清单，记录上次构建时的输入文件哈希
+MANIFEST_NAME = "build_manifest.json"
+# 构建逻辑变化时递增，使所有场景重新构建
+BUILD_VERSION = 1
+
+def begin_bulk_load(conn):
+    """批量导入前关闭同步写盘并使用内存日志"""
+    conn.execute("PRAGMA journal_mode = MEMORY")
+    conn.execute("PRAGMA synchronous = OFF")
+
+def end_bulk_load(conn):
+    """批量导入完成后恢复默认的日志和同步设置"""
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.execute("PRAGMA journal_mode = DELETE")
+
+def _optional_column(df, column):
+    """获取可选列，不存在时返回全空列"""
+    if column in df.columns:
+        return df[column]
+    return pd.Series(None, index=df.index, dtype=object)
+
+def clean_fund_nav(fund_code, df):
+    """向量化清洗基金净值数据，返回可直接用于executemany的元组列表"""
+    data = pd.DataFrame({
+        "fund_code": fund_code,
+        "date": df["FSRQ"],
+        "unit_nav": pd.to_numeric(df["DWJZ"], errors="coerce"),
+        "acc_nav": pd.to_numeric(df["LJJZ"], errors="coerce"),
+        "daily_growth": pd.to_numeric(_optional_column(df, "JZZZL"), errors="coerce"),
+        "status_purchase": _optional_column(df, "SGZT"),
+        "status_redeem": _optional_column(df, "SHZT"),
+    })
+    # 空值转换为None，写入数据库时为NULL
+    data = data.astype(object).where(data.notna(), None)
+    return list(data.itertuples(index=False, name=None))
+
+def clean_index_data(index_code, csv_path):
+    """向量化读取并清洗指数历史数据CSV，返回可直接用于executemany的元组列表"""
+    df = pd.read_csv(csv_path, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+    if df.shape[1] < 7:
+        return []
+
+    df = df.iloc[:, :7]
+    df.columns = ["date", "close", "open", "high", "low", "volume", "change_pct"]
+
+    # 价格列去除千分位逗号后转换为浮点数
+    prices = df[["close", "open", "high", "low"]].apply(
+        lambda col: pd.to_numeric(col.str.replace(",", "", regex=False), errors="coerce")
+    )
+    valid = prices.notna().all(axis=1)
+    invalid = ~valid & (df["close"] != "")
+    if invalid.any():
+        print(f"指数 {index_code} 数据转换错误，已跳过日期: {df.loc[invalid, 'date'].tolist()}")
+
+    data = pd.concat([df[["date"]], prices, df[["volume", "change_pct"]]], axis=1)[valid]
+    data.insert(0, "index_code", index_code)
+    return list(data.astype(object).itertuples(index=False, name=None))
+
+def load_config(scene_dir):
+    """读取场景配置并补全默认值"""
+    with open(Path(scene_dir) / CONFIG_NAME, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config.setdefault("funds", {})
+    config.setdefault("indices", {})
+    config.setdefault("db_name", "fund_crisis.db")
+    config.setdefault("json_name", "fund_crisis.json")
+    config.setdefault("json_indent", 2)
+    config.setdefault("cache", True)
+    return config
+
+def discover_scenes(root=SCENE_ROOT):
+    """发现根目录下所有包含场景配置的场景目录"""
+    root = Path(root)
+    return sorted(path for path in root.iterdir() if (path / CONFIG_NAME).is_file())
+
+def fund_files(scene_dir, fund_mapping):
+    """获取场景目录中属于配置基金的净值CSV文件 {fund_code: 文件路径}"""
+    files = {}
+    for file_name in sorted(os.listdir(scene_dir)):
+        if file_name.endswith(".csv") and len(file_name) >= 6 and file_name[:6].isdigit():
+            fund_code = file_name[:6]
+            if fund_code in fund_mapping:
+                files[fund_code] = Path(scene_dir) / file_name
+    return files
+
+def index_files(scene_dir, index_mapping):
+    """获取场景目录中存在的指数CSV文件 {index_code: 文件路径}"""
+    files = {}
+    for index_code, index_info in index_mapping.items():
+        path = Path(scene_dir) / index_info["file"]
+        if path.exists():
+            files[index_code] = path
+    return files
+
+def _file_hash(path):
+    """计算文件内容的SHA-256，不受checkout等操作改变修改时间的影响"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def input_signature(scene_dir, config):
+    """计算场景所有输入文件（场景配置和CSV）的内容哈希"""
+    scene_dir = Path(scene_dir)
+    paths = [scene_dir / CONFIG_NAME]
+    paths += fund_files(scene_dir, config["funds"]).values()
+    paths += index_files(scene_dir, config["indices"]).values()
+    return {str(path.relative_to(scene_dir)): _file_hash(path) for path in paths}
+
+def _date_key(value):
+    """将 2009-6-1 或 2009-06-01 形式的日期转换为可比较的元组"""
+    return tuple(int(part) for part in re.findall(r'\d+', str(value)))
+
+def _rows_digest(rows):
+    """计算按日期排序后的数据行摘要，用于判断已导入的历史数据是否被修改"""
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(repr(row).encode('utf-8'))
+    return digest.hexdigest()
+
+def _ingest_file(cursor, state, source, csv_path, load_rows, insert_sql):
+    """
+    按高水位增量导入单个CSV文件
+
+    文件哈希未变化时直接跳过；高水位日期及之前的数据未被修改时只写入新增日期的数据，
+    否则重新写入整个文件
+
+    Args:
+        cursor: 数据库游标
+        state: 已有的导入记录 {source: (file_hash, max_date, history_hash)}，全量导入时为空字典
+        source: 导入记录的键，例如 fund_nav/000011
+        csv_path: CSV文件路径
+        load_rows: 读取并清洗CSV的函数，返回元组列表，第二列为日期
+        insert_sql: 写入数据的SQL语句
+
+    Returns:
+        写入的行数
+    """
+    file_hash = _file_hash(csv_path)
+    previous = state.get(source)
+    if previous and previous[0] == file_hash:
+        return 0
+
+    rows = sorted(load_rows(), key=lambda row: _date_key(row[1]))
+    new_rows = rows
+    if previous and previous[1]:
+        high_water = _date_key(previous[1])
+        old_count = sum(1 for row in rows if _date_key(row[1]) <= high_water)
+        if _rows_digest(rows[:old_count]) == previous[2]:
+            new_rows = rows[old_count:]
+        else:
+            print(f"{source} 的历史数据发生变化，重新导入整个文件")
+
+    cursor.executemany(insert_sql, new_rows)
+    cursor.execute('''
+    INSERT OR REPLACE INTO ingest_state
+    (source, file_hash, max_date, history_hash, row_count, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', (source, file_hash, rows[-1][1] if rows else None, _rows_digest(rows), len(rows),
+          datetime.datetime.now().isoformat(timespec='seconds')))
+    return len(new_rows)
+
+def _read_fund_rows(fund_code, csv_path):
+    """读取基金净值CSV，列不满足条件时返回空列表"""
+    df = pd.read_csv(csv_path)
+    if "FSRQ" in df.columns and "DWJZ" in df.columns and "LJJZ" in df.columns:
+        return clean_fund_nav(fund_code, df)
+    return []
+
+def create_tables(cursor):
+    """创建场景数据库的所有表（已存在时跳过）"""
+    # 创建基金表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS funds (
+        fund_code TEXT,
+        fund_name TEXT,
+        PRIMARY KEY (fund_code)
+    )
+    ''')
+
+    # 创建净值表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS fund_nav (
+        fund_code TEXT,
+        date TEXT,
+        unit_nav REAL,
+        acc_nav REAL,
+        daily_growth REAL,
+        status_purchase TEXT,
+        status_redeem TEXT,
+        PRIMARY KEY (fund_code, date),
+        FOREIGN KEY (fund_code) REFERENCES funds(fund_code)
+    )
+    ''')
+
+    # 创建指数表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS indices (
+        index_code TEXT,
+        index_name TEXT,
+        PRIMARY KEY (index_code)
+    )
+    ''')
+
+    # 创建指数历史数据表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS index_data (
+        index_code TEXT,
+        date TEXT,
+        close REAL,
+        open REAL,
+        high REAL,
+        low REAL,
+        volume TEXT,
+        change_pct TEXT,
+        PRIMARY KEY (index_code, date),
+        FOREIGN KEY (index_code) REFERENCES indices(index_code)
+    )
+    ''')
+
+    # 创建导入记录表，保存每个CSV文件的哈希和已导入的最大日期（高水位）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ingest_state (
+        source TEXT,
+        file_hash TEXT,
+        max_date TEXT,
+        history_hash TEXT,
+        row_count INTEGER,
+        updated_at TEXT,
+        PRIMARY KEY (source)
+    )
+    ''')
+
+def create_db(scene_dir, config, output_db_path, incremental=True):
+    """
+    将场景CSV文件转换为SQLite数据库（增量写入已有数据库）
+
+    Args:
+        scene_dir: 场景目录路径
+        config: 场景配置
+        output_db_path: 数据库文件路径
+        incremental: 是否按ingest_state表中记录的高水位只导入新增数据，为False时重新导入所有文件
+
+    Returns:
+        写入的数据行数
+    """
+    conn = sqlite3.connect(output_db_path)
+    begin_bulk_load(conn)
+    cursor = conn.cursor()
+
+    create_tables(cursor)
+
+    state = {}
+    if incremental:
+        cursor.execute("SELECT source, file_hash, max_date, history_hash FROM ingest_state")
+        state = {row[0]: row[1:] for row in cursor.fetchall()}
+    written = 0
+
+    # 插入基金信息
+    cursor.executemany("INSERT OR IGNORE INTO funds (fund_code, fund_name) VALUES (?, ?)",
+                       config["funds"].items())
+
+    # 处理基金CSV文件
+    for fund_code, csv_path in fund_files(scene_dir, config["funds"]).items():
+        try:
+            written += _ingest_file(
+                cursor, state, f"fund_nav/{fund_code}", csv_path,
+                lambda: _read_fund_rows(fund_code, csv_path),
+                '''
+                INSERT OR REPLACE INTO fund_nav
+                (fund_code, date, unit_nav, acc_nav, daily_growth, status_purchase, status_redeem)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                '''
+            )
+        except Exception as e:
+            print(f"处理基金文件 {csv_path.name} 时出错: {e}")
+
+    # 处理指数CSV文件
+    for index_code, csv_path in index_files(scene_dir, config["indices"]).items():
+        cursor.execute("INSERT OR IGNORE INTO indices (index_code, index_name) VALUES (?, ?)",
+                       (index_code, config["indices"][index_code]["name"]))
+        try:
+            written += _ingest_file(
+                cursor, state, f"index_data/{index_code}", csv_path,
+                lambda: clean_index_data(index_code, csv_path),
+                '''
+                INSERT OR REPLACE INTO index_data
+                (index_code, date, close, open, high, low, volume, change_pct)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                '''
+            )
+        except Exception as e:
+            print(f"处理指数文件 {csv_path.name} 时出错: {e}")
+
+    # 提交更改并关闭连接
+    conn.commit()
+    end_bulk_load(conn)
+    conn.close()
+
+    print(f"已成功更新数据库: {output_db_path}，写入 {written} 条记录")
+    return written
+
+# 导出的数据表：(JSON分组, 代码列, 名称列, 数据表, 数据列)
+EXPORT_TABLES = [
+    ("funds", "fund_code", "fund_name", "fund_nav",
+     ("date", "unit_nav", "acc_nav", "daily_growth", "status_purchase", "status_redeem")),
+    ("indices", "index_code", "index_name", "index_data",
+     ("date", "close", "open", "high", "low", "volume", "change_pct")),
+]
+
+def _open_output(path, compression=None):
+    """按压缩方式打开文本输出流"""
+    if compression is None:
+        return open(path, 'w', encoding='utf-8')
+    if compression == "gzip":
+        return gzip.open(path, 'wt', encoding='utf-8')
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("导出zstd压缩文件需要安装zstandard: pip install zstandard")
+        writer = zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+        return io.TextIOWrapper(writer, encoding='utf-8')
+    raise ValueError(f"不支持的压缩方式: {compression}")
+
+def _export_options(output_path):
+    """根据文件名推断导出格式和压缩方式，例如 fund_crisis.jsonl.gz -> (jsonl, gzip)"""
+    suffixes = Path(output_path).suffixes
+    compression = {".gz": "gzip", ".zst": "zstd"}.get(suffixes[-1] if suffixes else None)
+    if compression:
+        suffixes = suffixes[:-1]
+    export_format = "jsonl" if suffixes and suffixes[-1] == ".jsonl" else "json"
+    return export_format, compression
+
+def _iter_entities(conn, code_column, name_column, data_table, columns, table):
+    """逐个基金/指数读取数据，记录以游标迭代的生成器返回，不在内存中保存完整结果"""
+    for code, name in conn.execute(f"SELECT {code_column}, {name_column} FROM {table}").fetchall():
+        cursor = conn.execute(f"""
+            SELECT {', '.join(columns)}
+            FROM {data_table} WHERE {code_column} = ?
+            ORDER BY date
+        """, (code,))
+        yield code, name, (dict(zip(columns, row)) for row in cursor)
+
+def _write_jsonl(conn, out):
+    """以JSON Lines格式写出，每行一条与数据库表对应的记录"""
+    for table, code_column, name_column, data_table, columns in EXPORT_TABLES:
+        for code, name, records in _iter_entities(conn, code_column, name_column, data_table, columns, table):
+            out.write(json.dumps({"table": table, code_column: code, name_column: name}, ensure_ascii=False))
+            out.write("\n")
+            for record in records:
+                out.write(json.dumps({"table": data_table, code_column: code, **record}, ensure_ascii=False))
+                out.write("\n")
+
+def _write_json(conn, out, indent=2):
+    """逐条写出JSON，输出与json.dump(result, indent=indent)一致，indent为None时为紧凑格式"""
+    separator = ": " if indent is not None else ":"
+
+    def newline(level):
+        return "\n" + " " * (indent * level) if indent is not None else ""
+
+    def dumps(value, level=0):
+        text = json.dumps(value, ensure_ascii=False, indent=indent,
+                          separators=(",", separator))
+        return text.replace("\n", newline(level)) if indent is not None else text
+
+    out.write("{")
+    for table_index, (table, code_column, name_column, data_table, columns) in enumerate(EXPORT_TABLES):
+        out.write(("," if table_index else "") + newline(1) + dumps(table) + separator + "{")
+        entities = _iter_entities(conn, code_column, name_column, data_table, columns, table)
+        entity_count = 0
+        for code, name, records in entities:
+            out.write(("," if entity_count else "") + newline(2) + dumps(code) + separator + "{")
+            out.write(newline(3) + dumps(name_column) + separator + dumps(name) + ",")
+            out.write(newline(3) + dumps("records") + separator + "[")
+            record_count = 0
+            for record in records:
+                out.write(("," if record_count else "") + newline(4) + dumps(record, 4))
+                record_count += 1
+            out.write((newline(3) if record_count else "") + "]" + newline(2) + "}")
+            entity_count += 1
+        out.write((newline(1) if entity_count else "") + "}")
+    out.write(newline(0) + "}")
+
+def export_json_from_db(db_path, output_json_path, indent=2, export_format=None, compression=None):
+    """
+    从数据库流式导出JSON格式数据，逐个基金从游标读取并写出，内存占用与数据量无关
+
+    Args:
+        db_path: 数据库文件路径
+        output_json_path: 输出文件路径，未指定格式和压缩方式时按扩展名推断
+            （.json / .jsonl，可再加 .gz 或 .zst）
+        indent: 缩进空格数，None为不换行的紧凑格式（仅对json格式有效）
+        export_format: json 为单个JSON文档，jsonl 为每行一条记录的JSON Lines
+        compression: None、gzip 或 zstd
+    """
+    inferred_format, inferred_compression = _export_options(output_json_path)
+    export_format = export_format or inferred_format
+    compression = compression or inferred_compression
+
+    # 先写入临时文件再替换，避免读到写了一半的导出文件
+    tmp_path = f"{output_json_path}.tmp{os.getpid()}"
+    conn = sqlite3.connect(db_path)
+    try:
+        with _open_output(tmp_path, compression) as out:
+            if export_format == "jsonl":
+                _write_jsonl(conn, out)
+            else:
+                _write_json(conn, out, indent)
+        os.replace(tmp_path, output_json_path)
+    finally:
+        conn.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    print(f"已成功创建JSON文件: {output_json_path}")
+
+def _scene_loader(scene_dir):
+    """创建模拟系统的数据加载器，模拟系统模块仅在需要生成缓存时导入"""
+    if str(SIMULATION_DIR) not in sys.path:
+        sys.path.append(str(SIMULATION_DIR))
+    from data_loader import DataLoader
+    return DataLoader(scene_dir)
+
+def _read_manifest(manifest_path):
+    """读取构建清单，不存在或损坏时返回None"""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def build_scene(scene_dir, force=False, full=False):
+    """
+    构建单个场景，在工作进程中运行
+
+    Args:
+        scene_dir: 场景目录路径
+        force: 是否忽略构建清单强制重新构建
+        full: 是否忽略导入记录，重新导入所有CSV数据
+
+    Returns:
+        构建结果字典 {'scene', 'status', 'message', 'elapsed'}，status为 built/cached/skipped/error
+    """
+    scene_dir = Path(scene_dir)
+    started = time.perf_counter()
+    result = {'scene': scene_dir.name, 'status': 'skipped', 'message': '输入未变化'}
+
+    try:
+        config = load_config(scene_dir)
+        output_dir = scene_dir / "converted"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        db_path = output_dir / config["db_name"]
+        json_path = output_dir / config["json_name"]
+        manifest_path = output_dir / MANIFEST_NAME
+
+        signature = input_signature(scene_dir, config)
+        manifest = _read_manifest(manifest_path)
+        unchanged = (
+            not (force or full)
+            and manifest is not None
+            and manifest.get('version') == BUILD_VERSION
+            and manifest.get('inputs') == signature
+            and db_path.exists()
+            and json_path.exists()
+        )
+
+        # 输出文件直接捕获到结果中，避免多个进程的输出交错
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            if not unchanged:
+                written = create_db(scene_dir, config, db_path, incremental=not full)
+                export_json_from_db(db_path, json_path, indent=config["json_indent"])
+                result.update(status='built', message=f"{len(signature) - 1} 个CSV文件，写入 {written} 条记录")
+
+            # 数据库更新或缓存缺失时重新生成缓存
+            if config["cache"]:
+                loader = _scene_loader(scene_dir)
+                if not loader.cache.is_fresh():
+                    loader.load_all_data(use_cache=True)
+                    if unchanged:
+                        result.update(status='cached', message='仅重建场景缓存')
+
+        if not unchanged:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': BUILD_VERSION, 'inputs': signature}, f, ensure_ascii=False, indent=2)
+
+        # 转换过程中的错误提示一并返回
+        errors = [line for line in log.getvalue().splitlines() if '出错' in line or '错误' in line]
+        if errors:
+            result['message'] += '；' + '；'.join(errors)
+    except Exception as e:
+        result.update(status='error', message=str(e))
+
+    result['elapsed'] = time.perf_counter() - started
+    return result
+
+def build_scenes(scene_dirs, force=False, full=False, max_workers=None):
+    """
+    在进程池中并行构建多个场景
+
+    Args:
+        scene_dirs: 场景目录路径列表
+        force: 是否强制重新构建所有场景
+        full: 是否重新导入所有CSV数据，而不是只导入新增日期
+        max_workers: 进程数，默认不超过场景数和CPU核心数
+
+    Returns:
+        按场景名称排序的构建结果列表
+    """
+    if not scene_dirs:
+        return []
+
+    workers = max_workers or min(len(scene_dirs), os.cpu_count() or 1)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(build_scene, str(scene_dir), force, full) for scene_dir in scene_dirs]
+        for future in as_completed(futures):
+            result = future.result()
+            print(f"[{result['status']}] {result['scene']}: {result['message']} ({result['elapsed']:.2f}s)")
+            results.append(result)
+
+    return sorted(results, key=lambda item: item['scene'])
+
+def main():
+    parser = argparse.ArgumentParser(description="并行构建场景数据库、JSON和模拟缓存")
+    parser.add_argument('--root', type=str, default=str(SCENE_ROOT), help="场景根目录，默认为本脚本所在目录")
+    parser.add_argument('--scenes', nargs='+', help="只构建指定名称的场景，默认构建所有场景")
+    parser.add_argument('--force', action='store_true', help="忽略构建清单，强制重新构建")
+    parser.add_argument('--full', action='store_true', help="忽略导入记录，重新导入所有CSV数据")
+    parser.add_argument('--workers', type=int, help="并行进程数")
+    args = parser.parse_args()
+
+    scene_dirs = discover_scenes(args.root)
+    if args.scenes:
+        missing = set(args.scenes) - {path.name for path in scene_dirs}
+        if missing:
+            print(f"未找到场景: {', '.join(sorted(missing))}")
+        scene_dirs = [path for path in scene_dirs if path.name in args.scenes]
+
+    if not scene_dirs:
+        print(f"在 {args.root} 下没有找到包含 {CONFIG_NAME} 的场景目录")
+        return
+
+    print(f"开始构建 {len(scene_dirs)} 个场景...")
+    started = time.perf_counter()
+    results = build_scenes(scene_dirs, force=args.force, full=args.full, max_workers=args.workers)
+
+    failed = [result for result in results if result['status'] == 'error']
+    print(f"构建完成，用时 {time.perf_counter() - started:.2f}s，失败 {len(failed)} 个")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
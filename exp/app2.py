@@ -1,6 +1,6 @@
 import asyncio
 import os
-from autogen_ext.models.openai import OpenAIChatCompletionClient
+import sys
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import TextMentionTermination
@@ -9,19 +9,11 @@ from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
 from datetime import datetime
 from autogen_agentchat.ui import Console
 
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY") 
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.model_client import get_model_client
 
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    },
-)
+model_client = get_model_client()
 
 async def main():
 
@@ -1,8 +1,8 @@
 import asyncio
 import os
+import sys
 from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
 from autogen_agentchat.teams import Swarm, RoundRobinGroupChat, SelectorGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.messages import HandoffMessage
 from autogen_agentchat.conditions import HandoffTermination, MaxMessageTermination, TextMentionTermination
 from autogen_agentchat.ui import Console
@@ -11,19 +11,11 @@ from autogen_ext.agents.web_surfer import MultimodalWebSurfer
 from duckduckgo_search import DDGS  
 from datetime import datetime
 
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY") 
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.model_client import get_model_client
+
+model_client = get_model_client()
 
 def search_web_tool(query: str) -> str:
     """
@@ -1,26 +1,18 @@
 import asyncio
 import json
 import os
+import sys
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import RoundRobinGroupChat
 from autogen_agentchat.conditions import TextMentionTermination
 from autogen_agentchat.ui import Console
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_ext.tools.mcp import McpWorkbench, StdioServerParams
 
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.model_client import get_model_client, close_model_clients
 
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+model_client = get_model_client()
 
 async def main() -> None:
     """
@@ -107,7 +99,7 @@ async def main() -> None:
     
     finally:
         # 关闭模型客户端资源
-        await model_client.close()
+        await close_model_clients()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,24 +1,16 @@
 import asyncio
 import os
+import sys
 
 from autogen_ext.agents.web_surfer import MultimodalWebSurfer
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_agentchat.ui import Console
 
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat",
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY,
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    },
-)
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.model_client import get_model_client
+
+model_client = get_model_client()
 
 async def main() -> None:
 
@@ -5,26 +5,17 @@ import aiofiles  # 异步文件操作库
 import aiohttp  # 异步 HTTP 客户端库
 from autogen_core.memory import Memory, MemoryContent, MemoryMimeType  
 import os  
+import sys
 from pathlib import Path  # 面向对象的文件系统路径库
 from autogen_agentchat.agents import AssistantAgent  
 from autogen_agentchat.ui import Console  
 from autogen_ext.memory.chromadb import ChromaDBVectorMemory, PersistentChromaDBVectorMemoryConfig  # AutoGen 扩展中的 ChromaDB 向量内存
-from autogen_ext.models.openai import OpenAIChatCompletionClient  # AutoGen 扩展中的 OpenAI 聊天模型客户端
-
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat",  
-    base_url="https://api.deepseek.com",  
-    api_key=DEEPSEEK_API_KEY,  
-    model_info={  
-        "vision": False, 
-        "function_calling": True,  
-        "json_output": True,  
-        "family": "unknown",  
-        'multiple_system_messages': True,  # 模型是否支持多条系统消息
-    },
-)
+
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.model_client import get_model_client
+
+model_client = get_model_client(multiple_system_messages=True)
 
 # 定义一个简单的文档索引器类
 class SimpleDocumentIndexer:
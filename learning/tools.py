@@ -1,25 +1,31 @@
 import json
+import os
+import sys
 
-def recommend_from_json(query_str: str):
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.fts_index import get_index, load_json_documents
+
+# 学习资料库，索引保存在同目录的 doc_library.fts.db 中
+DOC_LIBRARY_PATH = "doc_library.json"
+
+def recommend_from_json(query_str: str, top_k: int = 5):
     try:
-        with open("doc_library.json", "r", encoding="utf-8") as f:
-            docs = json.load(f)
+        index = get_index(DOC_LIBRARY_PATH, load_json_documents)
+        # 支持多个关键词，用顿号、逗号分隔，只匹配正文，按BM25相关度排序
+        hits = index.search(query_str, top_k, columns=("content",))
     except FileNotFoundError:
         return [{"source": "错误", "section": "", "content": "找不到 doc_library.json 文件"}]
     except json.JSONDecodeError:
         return [{"source": "错误", "section": "", "content": "JSON 文件格式错误"}]
 
-    # 支持多个关键词，用顿号、逗号、空格等分隔
-    keywords = [kw.strip() for kw in query_str.replace("，", ",").replace("、", ",").split(",") if kw.strip()]
-    
-    matched = []
-    for doc in docs:
-        content = doc.get("content", "")
-        if any(kw in content for kw in keywords):
-            matched.append({
-                "source": doc.get("source", "未知来源"),
-                "section": doc.get("section", "未知章节"),
-                "content": content[:300]
-            })
+    matched = [
+        {
+            "source": hit["source"] or "未知来源",
+            "section": hit["section"] or "未知章节",
+            "content": hit["content"][:300]
+        }
+        for hit in hits
+    ]
 
-    return matched[:5] if matched else [{"source": "无结果", "section": "", "content": "没有找到相关学习资料"}]
+    return matched if matched else [{"source": "无结果", "section": "", "content": "没有找到相关学习资料"}]
@@ -5,32 +5,46 @@ import os
 # 添加父目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.system_file import file_writer
-from news_fetch import news_fetch
-from news_read import news_read
+from news_search import search_news, parse_news_results
+from news_read import news_analyze
+from news_store import NewsStore, NEWS_DIR
 
-async def news_cognitive(task: str, dir: str) -> None:
+async def news_cognitive(query: str, dir: str = NEWS_DIR) -> list:
     """
-    主函数，执行新闻获取和阅读任务。
+    主函数，执行新闻搜索、阅读分析和保存任务。
+
+    新闻搜索、正文抓取和结果写入都在本地完成，只有新闻总结和影响分析使用模型；
+    已经分析过的新闻链接会被跳过。
+
+    参数:
+        query (str): 新闻搜索关键词
+        dir (str): 保存分析结果的目录，默认为 database/news
+
+    返回:
+        list: 本次新写入的新闻ID列表
     """
-    # 执行新闻获取任务
-    news_data = await news_fetch(task)
-    print("\n获取的新闻数据:")
-    print(news_data)
-
-    # max_tokens = 60000 # 设置最大token数，deepseek-chat模型的最大token数为65536
-    
-    # 执行新闻阅读任务
-    news_summary = await news_read(news_data)
-    print("\n新闻摘要:")
-    print(news_summary)
-    
-    # 将结果写入文件 - 正确调用异步函数
-    await file_writer(news_summary, dir)
+    store = NewsStore(dir)
+
+    # 搜索新闻并解析搜索结果
+    result = await asyncio.to_thread(search_news, query)
+    news_items = parse_news_results(result)
+    print(f"\n获取到 {len(news_items)} 条新闻")
+
+    new_items = [item for item in news_items if not store.contains(item["link"])]
+    print(f"其中 {len(new_items)} 条尚未分析")
+
+    # 执行新闻阅读分析任务
+    analysis = await news_analyze(new_items)
+    for item in analysis:
+        print(f"\n{item['title']}\n{item['summary']}")
+
+    # 将结果写入本地新闻库
+    written = store.append(analysis)
+    print(f"\n已保存 {len(written)} 条新闻分析到 {dir}")
+    return written
 
 if __name__ == "__main__":
 
-    task = """查找关于"基金投资"的最新新闻，优先查找和中国相关的。"""
-    dir = "/Users/xueyicheng/Documents/SRTP/autogen/autogen_mcp/database/news"
+    query = "基金投资"
 
-    asyncio.run(news_cognitive(task, dir))
+    asyncio.run(news_cognitive(query))
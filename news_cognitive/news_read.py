@@ -3,36 +3,21 @@ import json
 import os
 from autogen_agentchat.agents import AssistantAgent
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.conditions import TextMentionTermination, MaxMessageTermination
-from autogen_agentchat.ui import Console
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_ext.tools.mcp import McpWorkbench, StdioServerParams
-from utils.web_fetch import fetch_text_from_url  
-from utils.system_file import file_writer
-
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+from autogen_agentchat.conditions import TextMentionTermination
+from utils.web_fetch import fetch_text_from_url, fetch_many
+from utils.model_client import get_model_client
+
+model_client = get_model_client(cache=True)
 
 async def news_read(task : str, max_len : int=1000000) -> str:
     news_read_agent = AssistantAgent(
         name="NewsReadAgent",
         model_client=model_client,
-        tools=[fetch_text_from_url],
+        tools=[fetch_many, fetch_text_from_url],
         system_message="""你是一个专业的新闻阅读助手，擅长分析财经新闻对基金投资的影响。
         任务流程：
-        1. 使用fetch_text_from_url工具获取输入中提供的每个URL的新闻内容，该工具
+        1. 使用fetch_many工具一次性获取输入中提供的所有URL的新闻内容，返回结果中ok为False的URL
+           可以再用fetch_text_from_url工具单独重试
         2. 对每篇新闻内容进行概括总结，提取关键信息
         3. 以专业金融分析师的角度分析该新闻对不同类型基金投资的具体影响
         4. 将分析结果按照规定JSON格式返回
@@ -70,6 +55,132 @@ async def news_read(task : str, max_len : int=1000000) -> str:
 
     return news_summary
 
+# 每批新闻正文合计的最大估计token数，为系统提示和模型回复留出上下文空间
+BATCH_MAX_TOKENS = 24000
+# 每批最多的新闻篇数，避免模型回复超出输出长度上限
+BATCH_MAX_ARTICLES = 5
+
+ANALYZE_SYSTEM_MESSAGE = """你是一个专业的财经新闻分析师，擅长分析财经新闻对基金投资的影响。
+输入是若干篇新闻的标题、链接和正文，请对每篇新闻：
+1. 概括总结新闻内容，提取关键事实和数据
+2. 以专业金融分析师的角度分析该新闻对不同类型基金(股票型、债券型、商品型等)投资的短期和长期影响，包含具体的投资策略建议
+
+只返回JSON数组，不要包含其他内容：
+[
+    {
+        "link": "新闻链接（与输入一致）",
+        "summary": "新闻内容的简明扼要总结",
+        "impact": "对不同类型基金投资的潜在影响"
+    }
+]
+"""
+
+def parse_analysis(content: str) -> list:
+    """从模型回复中解析新闻分析结果的JSON数组，解析失败时返回空列表"""
+    start, end = content.find("["), content.rfind("]")
+    if start == -1 or end <= start:
+        return []
+    try:
+        result = json.loads(content[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+    return [item for item in result if isinstance(item, dict)]
+
+def estimate_tokens(text: str) -> int:
+    """粗略估计文本的token数，按一个字符一个token计算，中文和英文混排时偏保守"""
+    return len(text)
+
+def batch_articles(articles: list, max_tokens: int = BATCH_MAX_TOKENS, max_articles: int = BATCH_MAX_ARTICLES) -> list:
+    """
+    将新闻按估计的token数分批，每批合计不超过 max_tokens，且不超过 max_articles 篇
+
+    单篇超过上限的新闻单独成为一批（正文已由 max_chars 截断）
+
+    返回:
+        list: [[新闻, ...], ...]
+    """
+    batches = []
+    batch, batch_tokens = [], 0
+    for article in articles:
+        tokens = estimate_tokens(json.dumps(article, ensure_ascii=False))
+        if batch and (batch_tokens + tokens > max_tokens or len(batch) >= max_articles):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(article)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+async def analyze_batch(articles: list) -> dict:
+    """
+    让模型分析一批新闻
+
+    返回:
+        dict: {新闻链接: {"link", "summary", "impact"}}
+    """
+    analyze_agent = AssistantAgent(
+        name="NewsAnalyzeAgent",
+        model_client=model_client,
+        system_message=ANALYZE_SYSTEM_MESSAGE,
+    )
+    task = json.dumps(
+        [{"title": a["title"], "link": a["link"], "content": a["content"]} for a in articles],
+        ensure_ascii=False
+    )
+    result = await analyze_agent.run(task=task)
+    return {item.get("link"): item for item in parse_analysis(result.messages[-1].content)}
+
+async def news_analyze(news_items: list, max_chars: int = 5000, max_tokens: int = BATCH_MAX_TOKENS) -> list:
+    """
+    分析新闻对基金投资的影响，正文在本地并发抓取，模型只负责总结和影响分析
+
+    新闻按估计的token数分批，各批次并发调用模型（并发数受共享模型客户端的上限约束），
+    某一批失败时只丢弃该批的结果，其余批次的分析结果照常返回
+
+    参数:
+        news_items (list): [{"title", "link", "source", "date"}, ...]
+        max_chars (int): 每篇新闻正文提供给模型的最大字符数
+        max_tokens (int): 每批新闻正文合计的最大估计token数
+
+    返回:
+        list: 在新闻条目基础上增加 summary 和 impact 字段的分析结果，
+              正文抓取失败或模型未返回分析的新闻不包含在结果中
+    """
+    if not news_items:
+        return []
+
+    pages = await fetch_many([item["link"] for item in news_items], maxlen=max_chars)
+    articles = [
+        {**item, "content": pages[item["link"]]["text"]}
+        for item in news_items if pages[item["link"]]["ok"]
+    ]
+    if not articles:
+        return []
+
+    batches = batch_articles(articles, max_tokens)
+    print(f"共 {len(articles)} 篇新闻，分 {len(batches)} 批分析")
+    results = await asyncio.gather(*(analyze_batch(batch) for batch in batches), return_exceptions=True)
+
+    analysis = {}
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            print(f"{len(batch)} 篇新闻分析失败: {result}")
+            continue
+        analysis.update(result)
+
+    return [
+        {
+            "title": a["title"],
+            "link": a["link"],
+            "source": a["source"],
+            "date": a["date"],
+            "summary": analysis[a["link"]].get("summary", ""),
+            "impact": analysis[a["link"]].get("impact", ""),
+        }
+        for a in articles if a["link"] in analysis
+    ]
+
 if __name__ == "__main__":
     task = """{
         "title": "“对等关税”政策刚满月 美国人从头到脚受打击",
@@ -0,0 +1,77 @@
+import os
+import sys
+
+# 添加父目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.web_fetch import get_session
+
+SERP_API_KEY = os.environ.get("SERP_API_KEY")
+SERP_API_URL = "https://serpapi.com/search.json"
+
+
+def search_news(query: str, gl: str = "cn", hl: str = "zh-cn", api_key: str = None, timeout: int = 30) -> dict:
+    """
+    直接调用SerpAPI的Google News搜索，与Google News MCP服务器使用相同的参数
+
+    参数:
+        query (str): 搜索关键词，例如"基金投资"
+        gl (str): 国家代码，默认"cn"
+        hl (str): 语言代码，默认"zh-cn"
+        api_key (str, optional): SerpAPI密钥，默认读取环境变量SERP_API_KEY
+        timeout (int): 请求超时时间（秒）
+
+    返回:
+        dict: SerpAPI返回的原始JSON
+    """
+    params = {
+        "engine": "google_news",
+        "q": query,
+        "gl": gl,
+        "hl": hl,
+        "api_key": api_key or SERP_API_KEY,
+    }
+    response = get_session().get(SERP_API_URL, params=params, timeout=timeout)
+    response.raise_for_status()
+    return response.json()
+
+
+def parse_news_results(result: dict) -> list:
+    """
+    从搜索结果的news_results字段中提取新闻条目，聚合新闻中的子条目会被展开，重复链接只保留一条
+
+    返回:
+        list: [{"title", "link", "source", "date"}, ...]
+    """
+    news = []
+    seen = set()
+    for item in result.get("news_results", []):
+        entries = [item]
+        if item.get("stories") or item.get("highlight"):
+            entries = ([item["highlight"]] if item.get("highlight") else []) + item.get("stories", [])
+
+        for entry in entries:
+            link = entry.get("link")
+            if not link or link in seen:
+                continue
+            seen.add(link)
+
+            # google_news引擎的来源为 {"name": ...}，旧格式为字符串
+            source = entry.get("source")
+            if isinstance(source, dict):
+                source = source.get("name")
+
+            news.append({
+                "title": entry.get("title", ""),
+                "link": link,
+                "source": source or "",
+                "date": entry.get("date", ""),
+            })
+    return news
+
+
+if __name__ == "__main__":
+    import json
+
+    news = parse_news_results(search_news("基金投资"))
+    print(json.dumps({"news": news}, ensure_ascii=False, indent=4))
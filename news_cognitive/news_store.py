@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+import datetime
+from utils.system_file import NEWS_DIR, INDEX_NAME, file_lock, read_index, save_document
+
+# 新闻分析结果在索引中的文档类型
+NEWS_KIND = "news"
+
+
+def news_id(link: str) -> str:
+    """根据新闻链接生成稳定的ID"""
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()[:16]
+
+
+class NewsStore:
+    def __init__(self, news_dir: str = NEWS_DIR):
+        """
+        新闻分析结果存储
+
+        每篇新闻通过 save_document 保存为一个以内容哈希命名的JSON文件，
+        目录下的 index.jsonl 记录文件名以及新闻的 id、link、date，用于去重和按ID读取
+
+        参数:
+            news_dir (str): 存储目录，默认为 database/news
+        """
+        self.news_dir = news_dir
+        self.index_path = os.path.join(news_dir, INDEX_NAME)
+        self._index = None
+
+    def load_index(self) -> dict:
+        """读取索引 {id: 索引条目}，首次调用后缓存在内存中"""
+        if self._index is None:
+            self._index = {
+                entry["id"]: entry
+                for entry in read_index(self.news_dir)
+                if entry.get("kind") == NEWS_KIND and "id" in entry
+            }
+        return self._index
+
+    def contains(self, link: str) -> bool:
+        """判断新闻是否已经分析并保存过"""
+        return news_id(link) in self.load_index()
+
+    def append(self, records: list) -> list:
+        """
+        追加新闻分析结果，已存在的链接会被跳过
+
+        参数:
+            records (list): 包含 link 字段的新闻分析结果列表
+
+        返回:
+            list: 新写入记录的ID列表
+        """
+        os.makedirs(self.news_dir, exist_ok=True)
+        # 与 save_document 使用同一把锁，去重检查和写入之间不会有其他写入方插入
+        with file_lock(self.index_path):
+            # 其他进程可能已追加新记录，加锁后重新读取索引
+            self._index = None
+            index = self.load_index()
+
+            written = []
+            for record in records:
+                record_id = news_id(record["link"])
+                if record_id in index:
+                    continue
+
+                record = {"id": record_id, **record, "saved_at": datetime.datetime.now().isoformat(timespec="seconds")}
+                entry = save_document(
+                    record,
+                    self.news_dir,
+                    kind=NEWS_KIND,
+                    title=record.get("title", ""),
+                    metadata={"id": record_id, "link": record["link"], "date": record.get("date", "")},
+                )
+                index[record_id] = entry
+                written.append(record_id)
+            return written
+
+    def get(self, record_id: str) -> dict:
+        """按ID读取一篇新闻分析结果，不存在时返回None"""
+        entry = self.load_index().get(record_id)
+        if entry is None:
+            return None
+        with open(os.path.join(self.news_dir, entry["file"]), "r", encoding="utf-8") as f:
+            return json.load(f)
@@ -0,0 +1,94 @@
+import numpy as np
+
+# 每年交易日数，用于年化
+TRADING_DAYS_PER_YEAR = 252
+
+
+def max_drawdown(values):
+    """基于累计最大值计算最大回撤（百分比）"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return 0.0
+    peak = np.maximum.accumulate(np.maximum(values, 0))
+    drawdown = np.divide(peak - values, peak, out=np.zeros_like(values), where=peak > 0)
+    return float(max(drawdown.max(), 0) * 100)
+
+
+def daily_returns(values):
+    """计算逐日收益率序列"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.size < 2:
+        return np.empty(0, dtype=np.float64)
+    return np.divide(np.diff(values), values[:-1], out=np.zeros(values.size - 1), where=values[:-1] != 0)
+
+
+def compute_metrics(net_worth, initial_capital, benchmark=None, trade_amounts=None,
+                    risk_free_rate=0.0, periods_per_year=TRADING_DAYS_PER_YEAR):
+    """
+    一次性计算所有表现指标
+
+    Args:
+        net_worth: 每个交易日的总资产序列
+        initial_capital: 初始资金
+        benchmark: 与net_worth逐日对齐的基准序列（如上证指数收盘价），可选
+        trade_amounts: 每笔成交金额，买入为正、卖出为负，用于计算换手率，可选
+        risk_free_rate: 年化无风险利率，例如0.02表示2%
+        periods_per_year: 每年交易日数
+
+    Returns:
+        指标字典，收益率、波动率、回撤等均为百分比
+    """
+    net_worth = np.asarray(net_worth, dtype=np.float64)
+    days = net_worth.size
+    final_assets = float(net_worth[-1]) if days else float(initial_capital)
+    total_return = (final_assets - initial_capital) / initial_capital * 100
+
+    returns = daily_returns(net_worth)
+    excess = returns - risk_free_rate / periods_per_year
+    volatility = float(returns.std(ddof=1) * np.sqrt(periods_per_year)) if returns.size > 1 else 0.0
+    downside = np.minimum(excess, 0)
+    downside_dev = float(np.sqrt(np.mean(downside ** 2)) * np.sqrt(periods_per_year)) if returns.size else 0.0
+    annual_excess = float(excess.mean() * periods_per_year) if returns.size else 0.0
+
+    # 年化收益率按实际交易日数折算
+    annual_return = 0.0
+    if days > 1 and final_assets > 0:
+        annual_return = ((final_assets / initial_capital) ** (periods_per_year / (days - 1)) - 1) * 100
+    drawdown = max_drawdown(net_worth)
+
+    metrics = {
+        'total_return': total_return,
+        'annual_return': annual_return,
+        'max_drawdown': drawdown,
+        'volatility': volatility * 100,
+        'sharpe_ratio': annual_excess / volatility if volatility > 0 else 0.0,
+        'sortino_ratio': annual_excess / downside_dev if downside_dev > 0 else 0.0,
+        'calmar_ratio': annual_return / drawdown if drawdown > 0 else 0.0,
+        'turnover': 0.0,
+        'market_return': 0.0,
+        'tracking_error': None,
+    }
+
+    # 换手率 = min(买入总额, 卖出总额) / 平均资产，建仓时的首次买入不计入换手
+    if trade_amounts is not None and days:
+        trade_amounts = np.asarray(trade_amounts, dtype=np.float64)
+        average_assets = net_worth.mean()
+        if average_assets > 0:
+            traded = min(trade_amounts[trade_amounts > 0].sum(), np.abs(trade_amounts[trade_amounts < 0]).sum())
+            metrics['turnover'] = float(traded / average_assets * 100)
+
+    if benchmark is not None:
+        benchmark = np.asarray(benchmark, dtype=np.float64)
+        valid = ~np.isnan(benchmark)
+        if np.count_nonzero(valid) >= 2:
+            first, last = benchmark[valid][0], benchmark[valid][-1]
+            metrics['market_return'] = float((last - first) / first * 100)
+        # 跟踪误差只使用基准前后两天都有数据的交易日
+        if benchmark.size == days and days > 2:
+            paired = valid[1:] & valid[:-1]
+            if np.count_nonzero(paired) > 1:
+                active = returns[paired] - daily_returns(benchmark)[paired]
+                metrics['tracking_error'] = float(active.std(ddof=1) * np.sqrt(periods_per_year) * 100)
+
+    metrics['outperformance'] = total_return - metrics['market_return']
+    return metrics
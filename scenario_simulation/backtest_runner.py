@@ -0,0 +1,154 @@
+import io
+import contextlib
+import numpy as np
+from data_loader import DataLoader
+from market_store import INDEX_CODES
+import analytics
+
+# 成交记录的结构化数组类型
+TRADE_DTYPE = np.dtype([
+    ('day', np.int64),      # 交易日（int64天数）
+    ('fund', np.int32),     # 基金在MarketStore中的行号
+    ('side', np.int8),      # 1为买入，-1为卖出
+    ('shares', np.float64),
+    ('nav', np.float64),
+    ('amount', np.float64),
+])
+
+
+def load_scene(scene_path, use_cache=True):
+    """静默加载场景数据，返回DataLoader.load_all_data()的结果"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DataLoader(scene_path).load_all_data(use_cache=use_cache)
+
+
+class BacktestRunner:
+    def __init__(self, scene_path=None, data=None):
+        """
+        无界面批量回测引擎
+
+        Args:
+            scene_path: 场景数据目录路径
+            data: 已加载的场景数据（DataLoader.load_all_data()的结果），传入后不再重复加载
+        """
+        if data is None:
+            data = load_scene(scene_path)
+        self.data = data
+        self.market = data['market']
+
+        # 可交易基金在行情矩阵中的行号（不含指数）
+        self.tradable = {
+            code: self.market.code_index[code]
+            for code in data['fund_codes']
+            if code not in INDEX_CODES and code in self.market.code_index
+        }
+
+        # 与InvestmentSimulator一致的模拟开始位置
+        self.start_index = 0
+        if data.get('simulation_start_date'):
+            start_index = self.market.index_on_or_after(data['simulation_start_date'])
+            if start_index < len(self.market):
+                self.start_index = start_index
+
+    def run(self, strategy, initial_capital=100000):
+        """
+        在整个时间线上运行策略
+
+        Args:
+            strategy: 策略函数 strategy(day_index, market, cash, holdings)，
+                每个交易日调用一次，返回订单列表 [(action, fund_code, value), ...]。
+                action为'buy'时value为买入金额，为'sell'时value为卖出份额；
+                holdings为按MarketStore行号排列的持有份额数组，策略不应修改它
+            initial_capital: 初始资金
+
+        Returns:
+            包含净值序列和成交记录数组的字典
+        """
+        market = self.market
+        days = len(market) - self.start_index
+        if days <= 0:
+            return {'success': False, 'message': '模拟时间线数据为空'}
+
+        cash = float(initial_capital)
+        holdings = np.zeros(len(market.codes), dtype=np.float64)
+        net_worth = np.empty(days, dtype=np.float64)
+        cash_history = np.empty(days, dtype=np.float64)
+        trades = []
+        rejected = 0
+
+        for offset in range(days):
+            day_index = self.start_index + offset
+            nav = market.nav[:, day_index]
+
+            for action, fund_code, value in strategy(day_index, market, cash, holdings) or ():
+                row = self.tradable.get(fund_code)
+                price = nav[row] if row is not None else np.nan
+                if row is None or np.isnan(price) or value <= 0:
+                    rejected += 1
+                    continue
+
+                if action == 'buy':
+                    if value > cash:
+                        rejected += 1
+                        continue
+                    shares = value / price
+                    holdings[row] += shares
+                    cash -= value
+                    trades.append((market.dates[day_index], row, 1, shares, price, value))
+                elif action == 'sell':
+                    if value > holdings[row]:
+                        rejected += 1
+                        continue
+                    amount = value * price
+                    holdings[row] -= value
+                    cash += amount
+                    trades.append((market.dates[day_index], row, -1, value, price, amount))
+                else:
+                    rejected += 1
+
+            cash_history[offset] = cash
+            net_worth[offset] = cash + np.nansum(holdings * nav)
+
+        return {
+            'success': True,
+            'dates': market.dates[self.start_index:],
+            'net_worth': net_worth,
+            'cash': cash_history,
+            'trades': np.array(trades, dtype=TRADE_DTYPE),
+            'rejected_orders': rejected,
+            'initial_capital': initial_capital,
+            'final_assets': float(net_worth[-1]),
+            'total_return': (float(net_worth[-1]) - initial_capital) / initial_capital * 100
+        }
+
+    def summarize(self, result):
+        """
+        计算与InvestmentSimulator.get_performance_summary()相同口径的表现指标
+
+        Args:
+            result: run()的返回结果
+        """
+        net_worth = result['net_worth']
+        trades = result['trades']
+
+        # 与回测区间对齐的上证指数基准序列
+        benchmark = self.market.series('sh_index', np.arange(self.start_index, len(self.market)))
+        metrics = analytics.compute_metrics(
+            net_worth, result['initial_capital'], benchmark=benchmark, trade_amounts=trades['amount'] * trades['side']
+        )
+
+        buy_count = int(np.count_nonzero(trades['side'] == 1))
+        sell_count = int(np.count_nonzero(trades['side'] == -1))
+
+        summary = {
+            'initial_capital': result['initial_capital'],
+            'final_assets': result['final_assets'],
+            'trade_count': {
+                'buy': buy_count,
+                'sell': sell_count,
+                'total': buy_count + sell_count
+            },
+            'simulation_days': len(net_worth),
+        }
+        summary.update(metrics)
+        return summary
@@ -5,6 +5,8 @@ import re
 import json
 import sqlite3
 from pathlib import Path
+from market_store import MarketStore, INDEX_CODES
+from scene_cache import SceneCache
 
 class DataLoader:
     def __init__(self, scene_path):
@@ -18,34 +20,50 @@ class DataLoader:
         self.funds_data = {}
         self.news_data = []
         self.timeline = []
+        self.nav_matrix = None
+        self.change_matrix = None
+        self.market = None
         self.simulation_start_date = None  # 初始化模拟开始日期
         # 使用传入的场景路径
         self.db_path = self.scene_path / "converted" / "fund_crisis.db"
+        self.fund_codes = []
+        # 场景预编译缓存，数据库或新闻文件变化时自动失效
+        self.cache = SceneCache(self.scene_path / "converted" / "cache", [self.db_path, self.scene_path / "新闻.json"])
         
-    def _convert_percentage(self, value):
+    def _convert_percentage(self, values):
         """
-        将百分比字符串转换为浮点数
-        例如："-2.65%" -> -2.65
+        将百分比字符串列批量转换为浮点数列
+        例如："-2.65%" -> -2.65，空值和无法转换的值使用0.0替代
         """
-        if pd.isna(value) or value is None:
-            return 0.0
-            
-        if isinstance(value, (int, float)):
-            return float(value)
-            
-        if isinstance(value, str):
-            # 去除百分号并转换为浮点数
-            value = value.replace('%', '')
-            try:
-                return float(value)
-            except ValueError:
-                print(f"警告：无法转换百分比值 '{value}'，使用0.0替代")
-                return 0.0
-                
-        return 0.0
+        if pd.api.types.is_numeric_dtype(values):
+            return values.astype(float).fillna(0.0)
+        
+        # 去除百分号并转换为浮点数
+        numeric = pd.to_numeric(values.astype(str).str.replace('%', '', regex=False), errors='coerce')
+        invalid = numeric.isna() & values.notna()
+        if invalid.any():
+            print(f"警告：无法转换百分比值 {values[invalid].unique().tolist()}，使用0.0替代")
+        return numeric.fillna(0.0)
+    
+    def _code_filter(self, column, codes, table):
+        """
+        构建按代码过滤的参数化SQL条件
+        
+        Returns:
+            (条件语句, 参数列表)；未指定代码时使用对应的代码表过滤
+        """
+        if codes is None:
+            return f"{column} IN (SELECT {column} FROM {table})", []
+        placeholders = ', '.join('?' for _ in codes)
+        return f"{column} IN ({placeholders})", list(codes)
     
-    def load_fund_data(self):
-        """从SQLite数据库加载所有基金历史数据"""
+    def load_fund_data(self, fund_codes=None):
+        """
+        从SQLite数据库加载所有基金历史数据
+        
+        Args:
+            fund_codes: 需要加载的基金代码列表，默认加载funds表中的所有基金
+        """
         print("从数据库加载基金数据...")
         
         if not self.db_path.exists():
@@ -57,50 +75,59 @@ class DataLoader:
             conn = sqlite3.connect(self.db_path)
             
             # 获取所有基金代码
-            funds_query = "SELECT fund_code FROM funds"
-            fund_codes = pd.read_sql_query(funds_query, conn)['fund_code'].tolist()
+            if fund_codes is None:
+                funds_query = "SELECT fund_code FROM funds"
+                fund_codes = pd.read_sql_query(funds_query, conn)['fund_code'].tolist()
+            
+            # 一次性查询所有基金净值数据
+            condition, params = self._code_filter('fund_code', fund_codes, 'funds')
+            query = f"""
+            SELECT 
+                fund_code, 
+                date as FSRQ, 
+                unit_nav as DWJZ, 
+                acc_nav as LJJZ, 
+                daily_growth as JZZZL, 
+                status_purchase, 
+                status_redeem 
+            FROM fund_nav 
+            WHERE {condition}
+            ORDER BY fund_code, date
+            """
+            
+            all_df = pd.read_sql_query(query, conn, params=params)
+            conn.close()
             
+            # 格式化日期
+            all_df['date'] = pd.to_datetime(all_df['FSRQ'])
+            
+            # 将涨跌幅转为数值类型 - 处理可能的百分比字符串
+            all_df['JZZZL'] = self._convert_percentage(all_df['JZZZL'])
+            
+            # 确保净值列为浮点数
+            for col in ['DWJZ', 'LJJZ']:
+                if col in all_df.columns:
+                    all_df[col] = pd.to_numeric(all_df[col], errors='coerce')
+            
+            # 按基金代码拆分
+            groups = {code: df.reset_index(drop=True) for code, df in all_df.groupby('fund_code', sort=False)}
             for fund_code in fund_codes:
-                # 查询基金净值数据
-                query = f"""
-                SELECT 
-                    fund_code, 
-                    date as FSRQ, 
-                    unit_nav as DWJZ, 
-                    acc_nav as LJJZ, 
-                    daily_growth as JZZZL, 
-                    status_purchase, 
-                    status_redeem 
-                FROM fund_nav 
-                WHERE fund_code = '{fund_code}'
-                ORDER BY date
-                """
-                
-                df = pd.read_sql_query(query, conn)
-                
-                # 格式化日期
-                df['date'] = pd.to_datetime(df['FSRQ'])
-                
-                # 将涨跌幅转为数值类型 - 处理可能的百分比字符串
-                df['JZZZL'] = df['JZZZL'].apply(self._convert_percentage)
-                
-                # 确保净值列为浮点数
-                for col in ['DWJZ', 'LJJZ']:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                
+                df = groups.get(fund_code, all_df.iloc[0:0].reset_index(drop=True))
                 self.funds_data[fund_code] = df
                 print(f"成功加载基金 {fund_code} 数据，包含 {len(df)} 条记录")
                 
-            conn.close()
-                
         except Exception as e:
             print(f"从数据库加载基金数据时出错: {e}")
         
         return self.funds_data
     
-    def load_index_data(self):
-        """从SQLite数据库加载指数数据"""
+    def load_index_data(self, index_codes=None):
+        """
+        从SQLite数据库加载指数数据
+        
+        Args:
+            index_codes: 需要加载的指数代码列表，默认加载indices表中的所有指数
+        """
         print("从数据库加载指数数据...")
         
         if not self.db_path.exists():
@@ -111,42 +138,55 @@ class DataLoader:
             # 连接到SQLite数据库
             conn = sqlite3.connect(self.db_path)
             
+            # 部分场景没有指数数据
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            if not {'indices', 'index_data'} <= tables:
+                conn.close()
+                print("场景数据库中没有指数数据")
+                return self.funds_data
+            
             # 获取所有指数代码
+            condition, params = self._code_filter('index_code', index_codes, 'indices')
             indices_query = "SELECT index_code, index_name FROM indices"
-            indices = pd.read_sql_query(indices_query, conn)
+            if index_codes is not None:
+                indices_query += f" WHERE {condition}"
+            indices = pd.read_sql_query(indices_query, conn, params=params)
             
-            for _, row in indices.iterrows():
-                index_code = row['index_code']
-                index_name = row['index_name']
-                
-                # 查询指数数据
-                query = f"""
-                SELECT 
-                    date,
-                    close as '收盘',
-                    open as '开盘',
-                    high as '最高',
-                    low as '最低',
-                    volume as '成交量',
-                    change_pct as '涨跌幅'
-                FROM index_data 
-                WHERE index_code = '{index_code}'
-                ORDER BY date
-                """
-                
-                df = pd.read_sql_query(query, conn)
-                
-                # 格式化日期
-                df['date'] = pd.to_datetime(df['date'])
-                
-                # 转换涨跌幅百分比字符串为浮点数
-                if '涨跌幅' in df.columns:
-                    df['涨跌幅'] = df['涨跌幅'].apply(self._convert_percentage)
-                
-                # 确保数值列为浮点数
-                for col in ['收盘', '开盘', '最高', '最低']:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
+            # 一次性查询所有指数数据
+            query = f"""
+            SELECT 
+                index_code,
+                date,
+                close as '收盘',
+                open as '开盘',
+                high as '最高',
+                low as '最低',
+                volume as '成交量',
+                change_pct as '涨跌幅'
+            FROM index_data 
+            WHERE {condition}
+            ORDER BY index_code, date
+            """
+            
+            all_df = pd.read_sql_query(query, conn, params=params)
+            conn.close()
+            
+            # 格式化日期
+            all_df['date'] = pd.to_datetime(all_df['date'])
+            
+            # 转换涨跌幅百分比字符串为浮点数
+            all_df['涨跌幅'] = self._convert_percentage(all_df['涨跌幅'])
+            
+            # 确保数值列为浮点数
+            for col in ['收盘', '开盘', '最高', '最低']:
+                all_df[col] = pd.to_numeric(all_df[col], errors='coerce')
+            
+            # 按指数代码拆分
+            groups = {code: df for code, df in all_df.groupby('index_code', sort=False)}
+            empty_df = all_df.iloc[0:0]
+            
+            for index_code, index_name in zip(indices['index_code'], indices['index_name']):
+                df = groups.get(index_code, empty_df).drop(columns=['index_code']).reset_index(drop=True)
                 
                 # 确定存储的键名
                 key_name = index_code
@@ -158,8 +198,6 @@ class DataLoader:
                 self.funds_data[key_name] = df
                 print(f"成功加载指数 {index_name}({index_code}) 数据，包含 {len(df)} 条记录")
                 
-            conn.close()
-                
         except Exception as e:
             print(f"从数据库加载指数数据时出错: {e}")
         
@@ -266,84 +304,108 @@ class DataLoader:
             print(f"获取最早有效日期时出错: {e}")
             return None
     
+    def _price_columns(self, fund_code):
+        """获取基金或指数的价格列和涨跌幅列名"""
+        if fund_code in INDEX_CODES:
+            return '收盘', '涨跌幅'
+        return 'DWJZ', 'JZZZL'
+    
+    def _build_market_matrix(self):
+        """
+        将所有基金数据对齐到同一日期索引上，一次性构建净值矩阵和涨跌幅矩阵
+        
+        Returns:
+            (nav_matrix, change_matrix, presence_matrix)，均以日期为索引、基金代码为列
+        """
+        frames = []
+        for fund_code, fund_data in self.funds_data.items():
+            if 'date' not in fund_data.columns or fund_data.empty:
+                continue
+            nav_col, change_col = self._price_columns(fund_code)
+            frames.append(pd.DataFrame({
+                'date': fund_data['date'].dt.normalize(),
+                'fund_code': fund_code,
+                'nav': fund_data[nav_col] if nav_col in fund_data.columns else float('nan'),
+                'change_pct': fund_data[change_col] if change_col in fund_data.columns else float('nan'),
+                'present': True
+            }))
+        
+        if not frames:
+            empty = pd.DataFrame(index=pd.DatetimeIndex([], name='date'))
+            return empty, empty.copy(), empty.copy()
+        
+        # 同一基金同一日期只保留第一条记录，然后一次性展开为宽表
+        long_df = pd.concat(frames, ignore_index=True)
+        long_df = long_df.drop_duplicates(subset=['date', 'fund_code'], keep='first')
+        wide = long_df.set_index(['date', 'fund_code']).unstack('fund_code').sort_index()
+        
+        # 保持与funds_data一致的列顺序
+        columns = [code for code in self.funds_data if code in wide['present'].columns]
+        nav_matrix = wide['nav'].reindex(columns=columns).astype(float)
+        change_matrix = wide['change_pct'].reindex(columns=columns).astype(float)
+        presence_matrix = wide['present'].reindex(columns=columns).notna()
+        
+        return nav_matrix, change_matrix, presence_matrix
+    
+    def _news_by_date(self):
+        """按日期归集新闻 {date: [content, ...]}"""
+        news_by_date = {}
+        for news in self.news_data:
+            news_by_date.setdefault(news['date'], []).append(news['content'])
+        return news_by_date
+    
+    def _timeline_from_market(self, news_by_date):
+        """根据列式行情存储和按日期归集的新闻构建时间线"""
+        timeline = []
+        for i in range(len(self.market)):
+            date = self.market.date_at(i)
+            timeline.append({
+                'date': date,
+                'news': list(news_by_date.get(date, [])),
+                'funds': self.market.snapshot(i)
+            })
+        return timeline
+    
     def build_timeline(self):
         """构建结合新闻和基金数据的时间线，确保每个交易日都有基金数据"""
         self.timeline = []
         
-        # 获取所有日期
-        all_dates = set()
+        # 一次性构建日期对齐的净值矩阵和涨跌幅矩阵
+        nav_matrix, change_matrix, presence_matrix = self._build_market_matrix()
         
-        # 添加基金数据日期
-        for fund_code, fund_data in self.funds_data.items():
-            if 'date' in fund_data.columns:
-                all_dates.update(fund_data['date'].dt.date)
-        
-        # 添加新闻日期
-        for news in self.news_data:
-            all_dates.add(news['date'])
+        # 按日期归集新闻
+        news_by_date = self._news_by_date()
         
-        # 排序日期
-        sorted_dates = sorted(all_dates)
+        # 所有日期 = 基金数据日期 ∪ 新闻日期
+        all_dates = presence_matrix.index.union(pd.DatetimeIndex(pd.to_datetime(list(news_by_date))))
         
-        # 获取最早有效日期
+        # 获取最早有效日期，过滤掉早于最早有效日期的日期
         earliest_valid_date = self.simulation_start_date or self.get_earliest_valid_date()
         if earliest_valid_date:
-            # 过滤掉早于最早有效日期的日期
-            sorted_dates = [date for date in sorted_dates if date >= earliest_valid_date]
+            all_dates = all_dates[all_dates >= pd.Timestamp(earliest_valid_date)]
         
         # 获取实际存在数据的基金代码（不包括指数）
-        fund_codes = []
-        for code in self.funds_data.keys():
-            if code not in ['sh_index', 'dj_index']:
-                df = self.funds_data[code]
-                if not df.empty:  # 只添加有数据的基金
-                    fund_codes.append(code)
-        
+        fund_codes = [
+            code for code, df in self.funds_data.items()
+            if code not in ['sh_index', 'dj_index'] and not df.empty
+        ]
         print(f"找到 {len(fund_codes)} 支有效基金数据")
         
-        # 构建时间线
-        valid_trading_days = []
-        for date in sorted_dates:
-            # 检查当天是否所有基金都有数据
-            all_funds_have_data = True
-            for fund_code in fund_codes:  # 只检查实际存在数据的基金
-                if fund_code in self.funds_data:
-                    fund_data = self.funds_data[fund_code]
-                    if 'date' in fund_data.columns:
-                        if fund_data[fund_data['date'].dt.date == date].empty:
-                            all_funds_have_data = False
-                            break
-            
-            # 只要基金数据齐全，就认为是有效交易日
-            if all_funds_have_data:
-                valid_trading_days.append(date)
+        # 对齐到全部日期后，向量化计算"当天所有基金都有数据"的掩码
+        presence_matrix = presence_matrix.reindex(all_dates, fill_value=False)
+        check_codes = [code for code in fund_codes if code in presence_matrix.columns]
+        valid_mask = presence_matrix[check_codes].all(axis=1)
+        valid_dates = all_dates[valid_mask.to_numpy()]
         
-        print(f"筛选后的有效交易日数量: {len(valid_trading_days)}")
+        print(f"筛选后的有效交易日数量: {len(valid_dates)}")
         
-        # 对有效交易日构建详细数据
-        for date in valid_trading_days:
-            date_events = {'date': date, 'news': [], 'funds': {}}
-            
-            # 添加当天新闻
-            for news in self.news_data:
-                if news['date'] == date:
-                    date_events['news'].append(news['content'])
-            
-            # 添加当天基金数据
-            for fund_code, fund_data in self.funds_data.items():
-                if 'date' in fund_data.columns:
-                    day_data = fund_data[fund_data['date'].dt.date == date]
-                    if not day_data.empty:
-                        day_info = {}
-                        # 基金数据
-                        if 'DWJZ' in day_data.columns:
-                            day_info['nav'] = float(day_data['DWJZ'].values[0])
-                        if 'JZZZL' in day_data.columns:
-                            day_info['change_pct'] = float(day_data['JZZZL'].values[0])
-                        
-                        date_events['funds'][fund_code] = day_info
-            
-            self.timeline.append(date_events)
+        # 保留对齐后的矩阵，供后续按列快速查询
+        self.nav_matrix = nav_matrix
+        self.change_matrix = change_matrix
+        self.market = MarketStore.from_matrices(nav_matrix, change_matrix, valid_dates)
+        
+        # 从列式存储中取出有效交易日的数据，构建详细时间线
+        self.timeline = self._timeline_from_market(news_by_date)
         
         print(f"成功构建时间线，包含 {len(self.timeline)} 个有效交易日")
         if self.timeline:
@@ -354,20 +416,44 @@ class DataLoader:
         
         return self.timeline
     
-    def load_all_data(self):
-        """加载所有数据"""
-        # 首先获取最早有效日期
-        self.simulation_start_date = self.get_earliest_valid_date()
+    def load_all_data(self, use_cache=True):
+        """
+        加载所有数据
         
-        self.load_fund_data()
-        self.load_news_data()
+        Args:
+            use_cache: 是否使用场景预编译缓存。命中缓存时直接内存映射行情矩阵，
+                不再读取数据库，此时funds_data为空字典
+        """
         description = self.load_scene_description()
-        self.build_timeline()
+        
+        cached = self.cache.load() if use_cache else None
+        if cached:
+            self.market = cached['market']
+            self.news_data = cached['news_data']
+            self.fund_codes = cached['fund_codes']
+            self.simulation_start_date = cached['simulation_start_date']
+            self.timeline = self._timeline_from_market(self._news_by_date())
+            print(f"从场景缓存加载时间线，包含 {len(self.timeline)} 个有效交易日")
+        else:
+            # 首先获取最早有效日期
+            self.simulation_start_date = self.get_earliest_valid_date()
+            
+            self.load_fund_data()
+            # 上证指数作为表现总结和回测的基准
+            self.load_index_data()
+            self.load_news_data()
+            self.build_timeline()
+            self.fund_codes = list(self.funds_data.keys())
+            
+            if use_cache and self.db_path.exists():
+                self.cache.save(self.market, self.news_data, self.fund_codes, self.simulation_start_date)
         
         return {
             'funds_data': self.funds_data,
+            'fund_codes': self.fund_codes,
             'news_data': self.news_data,
             'timeline': self.timeline,
+            'market': self.market,
             'description': description,
             'simulation_start_date': self.simulation_start_date
-        }
\ No newline at end of file
+        }
@@ -1,9 +1,11 @@
 import os
 import json
+import numpy as np
 import pandas as pd
 import datetime
 from pathlib import Path
 from data_loader import DataLoader
+import analytics
 
 class InvestmentSimulator:
     def __init__(self, scene_path, initial_capital=100000):
@@ -17,6 +19,8 @@ class InvestmentSimulator:
         self.scene_path = Path(scene_path)
         self.data_loader = DataLoader(scene_path)
         self.data = self.data_loader.load_all_data()
+        # 列式行情存储，所有价格查询都从这里读取
+        self.market = self.data['market']
         
         # 创建保存目录
         self.save_dir = self.scene_path / "save"
@@ -28,24 +32,15 @@ class InvestmentSimulator:
         # 获取模拟开始日期索引
         self.start_date_index = 0
         if 'simulation_start_date' in self.data and self.data['simulation_start_date']:
-            for i, day in enumerate(self.data['timeline']):
-                if day['date'] >= self.data['simulation_start_date']:
-                    self.start_date_index = i
-                    break
+            start_index = self.market.index_on_or_after(self.data['simulation_start_date'])
+            if start_index < len(self.market):
+                self.start_date_index = start_index
         
-        # 重置模拟器状态
+        # 重置模拟器状态（持仓、现金、当前日期和行为记录）
         self.reset_simulation()
         
-        # 模拟器状态
-        self.current_date_index = 0
-        self.current_date = None
-        self.is_simulation_over = False
-        
-        # 用户行为记录
-        self.user_actions = []
-        
         # 获取所有可交易的基金列表
-        self.available_funds = list(self.data['funds_data'].keys())
+        self.available_funds = list(self.data['fund_codes'])
         # 从基金列表中移除指数，因为指数不可直接交易
         if 'sh_index' in self.available_funds:
             self.available_funds.remove('sh_index')
@@ -57,7 +52,8 @@ class InvestmentSimulator:
         # 用户资产
         self.cash = self.initial_capital  # 现金
         self.holdings = {}  # 持仓 {fund_code: shares}
-        self.net_worth_history = []  # 净值历史
+        self.holdings_vector = np.zeros(len(self.market.codes))  # 按行情矩阵行号排列的持仓份额
+        self.net_worth_history = []  # 净值历史，每个交易日一条
         
         # 设置初始日期为获取的最早有效日期
         self.current_date_index = self.start_date_index
@@ -72,27 +68,59 @@ class InvestmentSimulator:
         # 记录初始资产状态
         self._update_net_worth()
     
+    def _set_holding(self, fund_code, shares):
+        """更新持仓份额，同步持仓字典和持仓向量"""
+        if shares > 0:
+            self.holdings[fund_code] = shares
+        else:
+            self.holdings.pop(fund_code, None)  # 如果份额为0，删除该基金持仓记录
+            shares = 0
+        
+        row = self.market.code_index.get(fund_code)
+        if row is not None:
+            self.holdings_vector[row] = shares
+    
     def _update_net_worth(self):
-        """更新当前净值"""
-        total_holdings_value = 0
+        """
+        更新当前交易日的净值记录，只在交易和日期推进时调用
         
-        # 计算持仓价值
-        for fund_code, shares in self.holdings.items():
-            # 获取当前日期的基金净值
-            fund_info = self._get_fund_info_by_date(fund_code, self.current_date)
-            if fund_info and 'nav' in fund_info:
-                total_holdings_value += shares * fund_info['nav']
+        同一交易日只保留一条净值历史，重复调用会覆盖当天的记录
+        """
+        # 跳过的交易日持仓不变，批量补齐这些天的净值记录
+        if self.net_worth_history and self.current_date is not None:
+            last_index = self.market.index_of(self.net_worth_history[-1]['date'])
+            if 0 <= last_index < self.current_date_index - 1:
+                skipped = slice(last_index + 1, self.current_date_index)
+                nav = np.nan_to_num(self.market.nav[:, skipped])
+                last_cash = self.net_worth_history[-1]['cash']
+                for offset, value in enumerate(self.holdings_vector @ nav):
+                    self.net_worth_history.append({
+                        'date': self.market.date_at(last_index + 1 + offset),
+                        'cash': last_cash,
+                        'holdings_value': float(value),
+                        'total_assets': last_cash + float(value)
+                    })
+        
+        # 持仓价值 = 持仓向量 · 当日净值向量
+        total_holdings_value = 0.0
+        if 0 <= self.current_date_index < len(self.market):
+            total_holdings_value = float(np.nansum(self.holdings_vector * self.market.nav[:, self.current_date_index]))
         
         # 计算总资产
         total_assets = self.cash + total_holdings_value
         
-        # 记录净值历史
-        self.net_worth_history.append({
+        record = {
             'date': self.current_date,
             'cash': self.cash,
             'holdings_value': total_holdings_value,
             'total_assets': total_assets
-        })
+        }
+        
+        # 记录净值历史
+        if self.net_worth_history and self.net_worth_history[-1]['date'] == self.current_date:
+            self.net_worth_history[-1] = record
+        else:
+            self.net_worth_history.append(record)
         
         return total_assets
     
@@ -101,12 +129,7 @@ class InvestmentSimulator:
         if date is None:
             return None
             
-        # 在时间线中查找对应日期的基金信息
-        for day in self.data['timeline']:
-            if day['date'] == date and fund_code in day['funds']:
-                return day['funds'][fund_code]
-        
-        return None
+        return self.market.get(fund_code, self.market.index_of(date))
     
     def _record_action(self, action_type, details):
         """记录用户行为"""
@@ -142,32 +165,35 @@ class InvestmentSimulator:
         indices_info = {}
         
         # 添加上证指数信息
-        if 'sh_index' in current_day['funds']:
+        sh_info = self.market.get('sh_index', self.current_date_index)
+        if sh_info:
             indices_info['上证指数'] = {
-                '收盘价': current_day['funds']['sh_index'].get('close', '暂无'),
-                '涨跌幅': current_day['funds']['sh_index'].get('change_pct', '暂无')
+                '收盘价': sh_info.get('close', '暂无'),
+                '涨跌幅': sh_info.get('change_pct', '暂无')
             }
             
         # 添加道琼斯指数信息
-        if 'dj_index' in current_day['funds']:
+        dj_info = self.market.get('dj_index', self.current_date_index)
+        if dj_info:
             indices_info['道琼斯指数'] = {
-                '收盘价': current_day['funds']['dj_index'].get('close', '暂无'),
-                '涨跌幅': current_day['funds']['dj_index'].get('change_pct', '暂无')
+                '收盘价': dj_info.get('close', '暂无'),
+                '涨跌幅': dj_info.get('change_pct', '暂无')
             }
         
         # 可交易基金信息
         funds_info = {}
         for fund_code in self.available_funds:
-            if fund_code in current_day['funds']:
+            fund_info = self.market.get(fund_code, self.current_date_index)
+            if fund_info:
                 funds_info[fund_code] = {
-                    '净值': current_day['funds'][fund_code].get('nav', '暂无'),
-                    '涨跌幅': current_day['funds'][fund_code].get('change_pct', '暂无')
+                    '净值': fund_info.get('nav', '暂无'),
+                    '涨跌幅': fund_info.get('change_pct', '暂无')
                 }
         
         # 用户当前持仓状态
         holdings_info = []
         for fund_code, shares in self.holdings.items():
-            fund_info = self._get_fund_info_by_date(fund_code, self.current_date)
+            fund_info = self.market.get(fund_code, self.current_date_index)
             if fund_info and 'nav' in fund_info:
                 value = shares * fund_info['nav']
                 holding = {
@@ -179,8 +205,8 @@ class InvestmentSimulator:
                 }
                 holdings_info.append(holding)
         
-        # 计算总资产
-        total_assets = self._update_net_worth()
+        # 总资产直接取当天的净值记录
+        total_assets = self.net_worth_history[-1]['total_assets'] if self.net_worth_history else self.cash
         
         return {
             'status': 'active',
@@ -237,8 +263,9 @@ class InvestmentSimulator:
         shares = amount / nav
         
         # 更新持仓和现金
-        self.holdings[fund_code] = self.holdings.get(fund_code, 0) + shares
+        self._set_holding(fund_code, self.holdings.get(fund_code, 0) + shares)
         self.cash -= amount
+        self._update_net_worth()
         
         # 记录操作
         self._record_action('buy', {
@@ -310,10 +337,9 @@ class InvestmentSimulator:
         amount = shares_to_sell * nav
         
         # 更新持仓和现金
-        self.holdings[fund_code] -= shares_to_sell
-        if self.holdings[fund_code] <= 0:
-            del self.holdings[fund_code]  # 如果份额为0，删除该基金持仓记录
+        self._set_holding(fund_code, current_shares - shares_to_sell)
         self.cash += amount
+        self._update_net_worth()
         
         # 记录操作
         self._record_action('sell', {
@@ -382,6 +408,7 @@ class InvestmentSimulator:
         
         # 更新当前日期
         self.current_date = self.data['timeline'][self.current_date_index]['date']
+        self._update_net_worth()
         
         # 收集上一个交易日到当前交易日之间的新闻
         between_news = self._collect_news_between_dates(previous_date, self.current_date)
@@ -445,22 +472,20 @@ class InvestmentSimulator:
             'to_date': target_date_str
         })
         
-        # 查找目标日期在时间线中的位置
-        found_date = False
-        original_date_index = self.current_date_index
-        
-        for i in range(self.current_date_index + 1, len(self.data['timeline'])):
-            if self.data['timeline'][i]['date'] >= target_date:
-                self.current_date_index = i
-                self.current_date = self.data['timeline'][i]['date']
-                found_date = True
-                break
+        # 查找目标日期在时间线中的位置（不早于目标日期的第一个交易日）
+        target_index = max(self.market.index_on_or_after(target_date), self.current_date_index + 1)
+        found_date = target_index < len(self.data['timeline'])
+        if found_date:
+            self.current_date_index = target_index
+            self.current_date = self.data['timeline'][target_index]['date']
+            self._update_net_worth()
         
         if not found_date:
             # 如果没有找到完全匹配的日期，但已经遍历到最后
             self.current_date_index = len(self.data['timeline']) - 1
             self.current_date = self.data['timeline'][self.current_date_index]['date']
             self.is_simulation_over = True
+            self._update_net_worth()
             
             # 收集前一个交易日到最后一个交易日之间的新闻
             between_news = self._collect_news_between_dates(previous_date, self.current_date)
@@ -572,58 +597,42 @@ class InvestmentSimulator:
                 'message': '没有足够的数据生成投资表现总结'
             }
         
-        # 计算关键指标
-        initial_assets = self.initial_capital
-        final_assets = self.net_worth_history[-1]['total_assets']
-        total_return = (final_assets - initial_assets) / initial_assets * 100
+        # 逐日总资产和对齐的上证指数基准序列
+        total_assets = np.array([item['total_assets'] for item in self.net_worth_history], dtype=np.float64)
+        positions = [self.market.index_of(item['date']) for item in self.net_worth_history]
+        benchmark = self.market.series('sh_index', positions)
         
-        # 计算最大回撤
-        max_drawdown = 0
-        peak = 0
+        # 成交金额（买入为正、卖出为负），用于计算换手率
+        trade_amounts = [
+            action['details']['amount'] if action['action_type'] == 'buy' else -action['details']['amount']
+            for action in self.user_actions
+            if action['action_type'] in ('buy', 'sell')
+        ]
         
-        for item in self.net_worth_history:
-            asset = item['total_assets']
-            if asset > peak:
-                peak = asset
-            drawdown = (peak - asset) / peak * 100 if peak > 0 else 0
-            max_drawdown = max(max_drawdown, drawdown)
+        # 一次性计算所有表现指标
+        metrics = analytics.compute_metrics(
+            total_assets, self.initial_capital, benchmark=benchmark, trade_amounts=trade_amounts
+        )
         
         # 统计交易次数
         buy_count = sum(1 for action in self.user_actions if action['action_type'] == 'buy')
         sell_count = sum(1 for action in self.user_actions if action['action_type'] == 'sell')
         
-        # 获取市场基准表现（上证指数）
-        market_performance = 0
-        first_index = None
-        last_index = None
-        
-        for day in self.data['timeline']:
-            if 'sh_index' in day['funds'] and 'close' in day['funds']['sh_index']:
-                if first_index is None:
-                    first_index = day['funds']['sh_index']['close']
-                    
-                # 持续更新，直到最后一天
-                last_index = day['funds']['sh_index']['close']
-        
-        if first_index and last_index:
-            market_performance = (last_index - first_index) / first_index * 100
+        summary = {
+            'initial_capital': self.initial_capital,
+            'final_assets': float(total_assets[-1]),
+            'trade_count': {
+                'buy': buy_count,
+                'sell': sell_count,
+                'total': buy_count + sell_count
+            },
+            'simulation_days': len(self.net_worth_history),
+        }
+        summary.update(metrics)
         
         return {
             'success': True,
-            'summary': {
-                'initial_capital': initial_assets,
-                'final_assets': final_assets,
-                'total_return': total_return,
-                'market_return': market_performance,
-                'outperformance': total_return - market_performance,
-                'max_drawdown': max_drawdown,
-                'trade_count': {
-                    'buy': buy_count,
-                    'sell': sell_count,
-                    'total': buy_count + sell_count
-                },
-                'simulation_days': len(self.net_worth_history),
-            }
+            'summary': summary
         }
 
     def get_data_by_date(self, days_ago=0, target_date=None, fund_code=None):
@@ -653,28 +662,12 @@ class InvestmentSimulator:
                 if target_date < timeline_start or target_date > timeline_end:
                     return {"success": False, "message": f"日期 {target_date} 超出模拟范围 ({timeline_start} 至 {timeline_end})"}
                 
-                # 查找最接近的交易日
-                closest_day = None
-                closest_diff = datetime.timedelta.max
-                
-                for day in self.data['timeline']:
-                    day_date = day['date']
-                    # 如果找到完全匹配的日期
-                    if day_date == target_date:
-                        closest_day = day
-                        break
-                    
-                    # 如果是过去的日期，保存差距最小的
-                    if day_date < target_date:
-                        diff = target_date - day_date
-                        if diff < closest_diff:
-                            closest_diff = diff
-                            closest_day = day
-                
-                if closest_day is None:
+                # 查找不晚于目标日期的最近交易日
+                date_index = self.market.index_on_or_before(target_date)
+                if date_index < 0:
                     return {"success": False, "message": f"在 {target_date} 之前没有有效交易日"}
                 
-                date_data = closest_day
+                date_data = self.data['timeline'][date_index]
                 
                 # 如果不是精确匹配，提醒用户
                 if date_data['date'] != target_date:
@@ -688,7 +681,8 @@ class InvestmentSimulator:
                 if days_ago > self.current_date_index:
                     return {"success": False, "message": f"无法查看 {days_ago} 天前的数据，超出模拟开始日期"}
                 
-                date_data = self.data['timeline'][self.current_date_index - days_ago]
+                date_index = self.current_date_index - days_ago
+                date_data = self.data['timeline'][date_index]
             
             # 构建结果数据
             result_data = {
@@ -699,7 +693,7 @@ class InvestmentSimulator:
             }
             
             # 添加所有数据
-            for fund_code_key, fund_info in date_data['funds'].items():
+            for fund_code_key, fund_info in self.market.snapshot(date_index).items():
                 # 区分指数和基金
                 if fund_code_key == 'sh_index':
                     result_data['indices']['上证指数'] = {
@@ -745,7 +739,6 @@ class InvestmentSimulator:
         try:
             # 确定是基金还是指数
             is_index = False
-            data_source = None
             display_name = fund_code
             
             # 处理基金代码，确保格式一致性
@@ -755,28 +748,19 @@ class InvestmentSimulator:
             if fund_code in ['sh_index', 'SH000001', '上证指数']:
                 is_index = True
                 fund_code = 'sh_index'
-                data_source = self.data['indices']['sh_index']
                 display_name = '上证指数'
             elif fund_code in ['dj_index', 'DJI', '道琼斯指数']:
                 is_index = True
                 fund_code = 'dj_index'
-                data_source = self.data['indices']['dj_index']
                 display_name = '道琼斯指数'
-            # 检查是否为基金
-            elif fund_code in self.data['funds']:
-                data_source = self.data['funds'][fund_code]
-            else:
+            
+            # 检查是否有该基金或指数的数据
+            if fund_code not in self.market.code_index:
                 return {"success": False, "message": f"找不到基金或指数: {fund_code}"}
             
-            # 获取当前日期
-            current_date = self.data['timeline'][self.current_day_index]['date']
-            
-            # 找到当前日期在时间线中的位置
-            current_idx = -1
-            for i, day in enumerate(self.data['timeline']):
-                if day['date'] == current_date:
-                    current_idx = i
-                    break
+            # 当前日期在时间线中的位置
+            current_idx = min(self.current_date_index, len(self.data['timeline']) - 1)
+            current_date = self.data['timeline'][current_idx]['date']
             
             # 限制天数不超过已有的数据
             days = min(days, current_idx + 1)
@@ -792,26 +776,15 @@ class InvestmentSimulator:
                     break
                     
                 date = self.data['timeline'][i]['date']
-                date_str = date.strftime("%Y-%m-%d")
-                
-                if not start_date:
-                    start_date = date
+                start_date = date
                 
                 # 检查该日期是否有数据
-                if date_str in data_source:
+                day_info = self.market.get(fund_code, i)
+                if day_info:
                     item = {
-                        'date': date_str
+                        'date': date.strftime("%Y-%m-%d")
                     }
-                    
-                    if is_index:
-                        item['close'] = data_source[date_str]['close']
-                        if 'change_pct' in data_source[date_str]:
-                            item['change_pct'] = data_source[date_str]['change_pct']
-                    else:
-                        item['nav'] = data_source[date_str]['nav']
-                        if 'change_pct' in data_source[date_str]:
-                            item['change_pct'] = data_source[date_str]['change_pct']
-                    
+                    item.update(day_info)
                     history_data.append(item)
             
             # 计算期间总收益率
@@ -822,9 +795,6 @@ class InvestmentSimulator:
                 if start_value > 0:
                     total_return = (end_value - start_value) / start_value * 100
             
-            # 结果按日期排序
-            history_data.sort(key=lambda x: x['date'], reverse=True)
-            
             return {
                 "success": True,
                 "fund_code": fund_code,
@@ -876,11 +846,7 @@ class InvestmentSimulator:
             last_date = datetime.datetime.strptime(last_date_str, '%Y-%m-%d').date()
             
             # 查找日期在时间线上的位置
-            found_idx = -1
-            for i, day in enumerate(self.data['timeline']):
-                if day['date'] == last_date:
-                    found_idx = i
-                    break
+            found_idx = self.market.index_of(last_date)
                     
             if found_idx == -1:
                 return {
@@ -894,18 +860,17 @@ class InvestmentSimulator:
             
             # 恢复持仓（需要从操作记录中重建）
             self.holdings = {}
+            self.holdings_vector = np.zeros(len(self.market.codes))
             for action in history_data['actions']:
                 if action['action_type'] == 'buy':
                     fund_code = action['details']['fund_code']
                     shares = action['details']['shares']
-                    self.holdings[fund_code] = self.holdings.get(fund_code, 0) + shares
+                    self._set_holding(fund_code, self.holdings.get(fund_code, 0) + shares)
                 elif action['action_type'] == 'sell':
                     fund_code = action['details']['fund_code']
                     shares = action['details']['shares']
                     if fund_code in self.holdings:
-                        self.holdings[fund_code] -= shares
-                        if self.holdings[fund_code] <= 0:
-                            del self.holdings[fund_code]
+                        self._set_holding(fund_code, self.holdings[fund_code] - shares)
             
             # 设置当前日期和索引
             self.current_date_index = found_idx
@@ -924,6 +889,9 @@ class InvestmentSimulator:
                     'holdings_value': record['holdings_value'],
                     'total_assets': record['total_assets']
                 })
+            
+            # 按恢复后的持仓更新当天的净值记录
+            self._update_net_worth()
                 
             return {
                 'success': True,
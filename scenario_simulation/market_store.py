@@ -0,0 +1,152 @@
+import datetime
+import numpy as np
+from pathlib import Path
+
+# 指数代码，指数的价格字段为收盘价而不是净值
+INDEX_CODES = ('sh_index', 'dj_index')
+
+
+class MarketStore:
+    def __init__(self, dates, codes, nav, change):
+        """
+        列式行情存储
+
+        Args:
+            dates: 交易日列表，按时间升序排列
+            codes: 基金/指数代码列表，对应矩阵的行
+            nav: 基金数 × 交易日数 的净值矩阵（指数为收盘价），缺失数据为NaN
+            change: 基金数 × 交易日数 的涨跌幅矩阵，缺失数据为NaN
+        """
+        # 日期以int64天数存储（自1970-01-01起）
+        self.dates = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+        self.codes = list(codes)
+        self.code_index = {code: i for i, code in enumerate(self.codes)}
+        # 日期到位置的映射，构建一次后所有按日期的查询都是O(1)
+        self.date_index = {self.date_at(i): i for i in range(len(self.dates))}
+        self.nav = np.ascontiguousarray(nav, dtype=np.float64).reshape(len(self.codes), len(self.dates))
+        self.change = np.ascontiguousarray(change, dtype=np.float64).reshape(len(self.codes), len(self.dates))
+
+    @classmethod
+    def from_matrices(cls, nav_matrix, change_matrix, dates):
+        """
+        从DataLoader构建的日期×基金矩阵创建存储
+
+        Args:
+            nav_matrix: 以日期为索引、基金代码为列的净值DataFrame
+            change_matrix: 以日期为索引、基金代码为列的涨跌幅DataFrame
+            dates: 时间线中的交易日列表
+        """
+        index = np.asarray(dates, dtype='datetime64[ns]')
+        codes = list(nav_matrix.columns)
+        nav = nav_matrix.reindex(index).to_numpy(dtype=np.float64).T
+        change = change_matrix.reindex(index, columns=codes).to_numpy(dtype=np.float64).T
+        return cls(dates, codes, nav, change)
+
+    def save(self, directory):
+        """将日期、净值和涨跌幅矩阵分别保存为.npy文件"""
+        directory = Path(directory)
+        np.save(directory / 'dates.npy', self.dates)
+        np.save(directory / 'nav.npy', self.nav)
+        np.save(directory / 'change.npy', self.change)
+
+    @classmethod
+    def load(cls, directory, codes, mmap_mode='r'):
+        """
+        从.npy文件加载存储，默认以只读内存映射方式打开
+
+        Args:
+            directory: save()写入的目录
+            codes: 矩阵各行对应的基金/指数代码
+            mmap_mode: 传给np.load的内存映射模式，None表示完整读入内存
+        """
+        directory = Path(directory)
+        dates = np.load(directory / 'dates.npy', mmap_mode=mmap_mode)
+        nav = np.load(directory / 'nav.npy', mmap_mode=mmap_mode)
+        change = np.load(directory / 'change.npy', mmap_mode=mmap_mode)
+        return cls(dates, codes, nav, change)
+
+    def __len__(self):
+        return len(self.dates)
+
+    @staticmethod
+    def to_day_number(date):
+        """将日期转换为int64天数"""
+        return int(np.datetime64(date, 'D').astype(np.int64))
+
+    def date_at(self, index):
+        """获取指定位置的交易日"""
+        return datetime.date(1970, 1, 1) + datetime.timedelta(days=int(self.dates[index]))
+
+    def index_of(self, date):
+        """获取交易日所在位置，不是交易日时返回-1"""
+        return self.date_index.get(date, -1)
+
+    def index_on_or_before(self, date):
+        """获取不晚于指定日期的最近交易日位置，不存在时返回-1"""
+        return int(np.searchsorted(self.dates, self.to_day_number(date), side='right')) - 1
+
+    def index_on_or_after(self, date):
+        """获取不早于指定日期的最近交易日位置，不存在时返回len(self)"""
+        return int(np.searchsorted(self.dates, self.to_day_number(date), side='left'))
+
+    def get(self, code, index):
+        """
+        获取某只基金或指数在指定位置的行情
+
+        Returns:
+            基金返回 {'nav', 'change_pct'}，指数返回 {'close', 'change_pct'}，无数据时返回None
+        """
+        row = self.code_index.get(code)
+        if row is None or index < 0 or index >= len(self.dates):
+            return None
+
+        value = self.nav[row, index]
+        if np.isnan(value):
+            return None
+
+        info = {'close' if code in INDEX_CODES else 'nav': float(value)}
+        change = self.change[row, index]
+        if not np.isnan(change):
+            info['change_pct'] = float(change)
+        return info
+
+    def snapshot(self, index):
+        """获取指定位置所有有数据的基金和指数行情 {code: info}"""
+        result = {}
+        for code in self.codes:
+            info = self.get(code, index)
+            if info is not None:
+                result[code] = info
+        return result
+
+    def series(self, code, positions=None):
+        """
+        获取某只基金或指数的价格序列
+
+        Args:
+            code: 基金或指数代码
+            positions: 交易日位置数组，默认整个时间线；位置为-1时对应NaN
+
+        Returns:
+            float64数组，没有该代码时返回None
+        """
+        row = self.code_index.get(code)
+        if row is None:
+            return None
+        if positions is None:
+            return self.nav[row]
+
+        positions = np.asarray(positions, dtype=np.int64)
+        return np.where(positions >= 0, self.nav[row, np.maximum(positions, 0)], np.nan)
+
+    def first_last(self, code):
+        """获取某只基金或指数第一个和最后一个有效价格，无数据时返回(None, None)"""
+        row = self.code_index.get(code)
+        if row is None:
+            return None, None
+
+        values = self.nav[row]
+        valid = np.flatnonzero(~np.isnan(values))
+        if valid.size == 0:
+            return None, None
+        return float(values[valid[0]]), float(values[valid[-1]])
@@ -2,6 +2,7 @@
 import os
 import sys
 import argparse
+import pandas as pd
 from pathlib import Path
 from simulation_app import SimulationApp
 
@@ -26,19 +27,51 @@ def select_scene():
             return choice
         print("输入无效，请重新选择")
 
+def get_database_dir():
+    """获取场景数据根目录"""
+    current_dir = Path(__file__).parent
+    return Path(os.path.dirname(current_dir)) / "database" / "scene"
+
+def run_sweep_command(args):
+    """批量回测：并行运行 场景×策略×初始资金 的所有组合并汇总结果"""
+    from sweep import run_sweep
+
+    database_dir = get_database_dir()
+    scene_dirs = {SCENE_CHOICES[code]: database_dir / SCENE_CHOICES[code] for code in args.scenes}
+    capitals = args.capitals or [args.capital]
+
+    print(f"批量回测: {len(scene_dirs)} 个场景 × {len(args.strategies)} 个策略 × {len(capitals)} 组初始资金")
+    results = run_sweep(scene_dirs, args.strategies, capitals, max_workers=args.workers)
+
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(results.to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n回测结果已保存到: {args.output}")
+
 def main():
     parser = argparse.ArgumentParser(description="多场景基金投资模拟系统")
     parser.add_argument('--capital', type=float, default=100000, help="初始资金，默认100000元")
     parser.add_argument('--debug', action='store_true', help="启用调试模式")
     parser.add_argument('--import-file', type=str, help="导入历史投资记录文件路径")
+    parser.add_argument('--sweep', action='store_true', help="批量回测模式，不进入交互界面")
+    parser.add_argument('--scenes', nargs='+', choices=list(SCENE_CHOICES), default=list(SCENE_CHOICES), help="批量回测的场景编号，默认全部")
+    parser.add_argument('--strategies', nargs='+', default=['buy_and_hold'], help="批量回测的策略，例如 momentum:lookback=10,top=2")
+    parser.add_argument('--capitals', nargs='+', type=float, help="批量回测的初始资金列表，默认使用--capital")
+    parser.add_argument('--workers', type=int, help="批量回测的进程数，默认使用所有CPU核心")
+    parser.add_argument('--output', type=str, help="批量回测结果CSV文件路径")
     args = parser.parse_args()
 
+    if args.sweep:
+        run_sweep_command(args)
+        return
+
     # 交互式选择场景
     scene_code = select_scene()
 
     # 获取场景目录路径
-    current_dir = Path(__file__).parent
-    database_dir = Path(os.path.dirname(current_dir)) / "database" / "scene"
+    database_dir = get_database_dir()
     scene_dir = database_dir / SCENE_CHOICES[scene_code]
 
     # 检查场景目录是否存在
@@ -0,0 +1,126 @@
+import os
+import json
+import shutil
+import datetime
+from pathlib import Path
+from market_store import MarketStore
+
+# 缓存格式版本，缓存结构变化时递增，旧缓存会自动失效
+CACHE_VERSION = 2
+
+
+class SceneCache:
+    def __init__(self, cache_dir, sources):
+        """
+        场景预编译缓存
+
+        Args:
+            cache_dir: 缓存目录路径
+            sources: 缓存依赖的源文件路径列表，任一文件变化都会使缓存失效
+        """
+        self.cache_dir = Path(cache_dir)
+        self.sources = [Path(source) for source in sources]
+        self.manifest_path = self.cache_dir / "manifest.json"
+
+    def _source_signature(self):
+        """获取源文件签名（大小和修改时间），不存在的文件记为None"""
+        signature = {}
+        for source in self.sources:
+            if source.exists():
+                stat = source.stat()
+                signature[source.name] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            else:
+                signature[source.name] = None
+        return signature
+
+    def _read_manifest(self):
+        """读取缓存清单，缓存不存在或与源文件不一致时返回None"""
+        if not self.manifest_path.exists():
+            return None
+
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        if manifest.get('version') != CACHE_VERSION or manifest.get('sources') != self._source_signature():
+            return None
+        return manifest
+
+    def is_fresh(self):
+        """仅检查清单判断缓存是否有效，不加载行情数组"""
+        try:
+            return self._read_manifest() is not None
+        except Exception:
+            return False
+
+    def load(self):
+        """
+        读取缓存
+
+        Returns:
+            缓存有效时返回包含 market/news_data/fund_codes/simulation_start_date 的字典，否则返回None
+        """
+        if not self.manifest_path.exists():
+            return None
+
+        try:
+            manifest = self._read_manifest()
+            if manifest is None:
+                print("场景缓存已过期，重新构建")
+                return None
+
+            with open(self.cache_dir / "news.json", 'r', encoding='utf-8') as f:
+                news_data = [
+                    {'date': datetime.date.fromisoformat(item['date']), 'content': item['content']}
+                    for item in json.load(f)
+                ]
+
+            start_date = manifest['simulation_start_date']
+            return {
+                'market': MarketStore.load(self.cache_dir, manifest['codes']),
+                'news_data': news_data,
+                'fund_codes': manifest['fund_codes'],
+                'simulation_start_date': datetime.date.fromisoformat(start_date) if start_date else None
+            }
+        except Exception as e:
+            print(f"读取场景缓存时出错: {e}")
+            return None
+
+    def save(self, market, news_data, fund_codes, simulation_start_date):
+        """
+        写入缓存，先写入临时目录再整体替换，避免读到写了一半的缓存
+
+        Args:
+            market: MarketStore 列式行情存储
+            news_data: 新闻列表 [{'date', 'content'}]
+            fund_codes: 场景中所有基金和指数代码
+            simulation_start_date: 模拟开始日期
+        """
+        tmp_dir = self.cache_dir.with_name(f"{self.cache_dir.name}.tmp{os.getpid()}")
+        try:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+
+            market.save(tmp_dir)
+            with open(tmp_dir / "news.json", 'w', encoding='utf-8') as f:
+                json.dump(
+                    [{'date': item['date'].isoformat(), 'content': item['content']} for item in news_data],
+                    f, ensure_ascii=False
+                )
+
+            manifest = {
+                'version': CACHE_VERSION,
+                'sources': self._source_signature(),
+                'codes': market.codes,
+                'fund_codes': list(fund_codes),
+                'simulation_start_date': simulation_start_date.isoformat() if simulation_start_date else None,
+                'created_at': datetime.datetime.now().isoformat()
+            }
+            with open(tmp_dir / "manifest.json", 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.replace(tmp_dir, self.cache_dir)
+            print(f"场景缓存已写入: {self.cache_dir}")
+        except Exception as e:
+            print(f"写入场景缓存时出错: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
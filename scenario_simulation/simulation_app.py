@@ -477,6 +477,12 @@ class SimulationApp:
         print(f"市场收益率(上证指数): {summary['market_return']:+.2f}%")
         print(f"超额收益: {summary['outperformance']:+.2f}%")
         print(f"最大回撤: {summary['max_drawdown']:.2f}%")
+        print(f"年化收益率: {summary['annual_return']:+.2f}%")
+        print(f"年化波动率: {summary['volatility']:.2f}%")
+        print(f"夏普比率: {summary['sharpe_ratio']:.2f}  索提诺比率: {summary['sortino_ratio']:.2f}  卡玛比率: {summary['calmar_ratio']:.2f}")
+        print(f"换手率: {summary['turnover']:.2f}%")
+        if summary['tracking_error'] is not None:
+            print(f"跟踪误差: {summary['tracking_error']:.2f}%")
         print(f"交易次数: {summary['trade_count']['total']} (买入: {summary['trade_count']['buy']}, 卖出: {summary['trade_count']['sell']})")
         print(f"模拟天数: {summary['simulation_days']} 天")
         print("="*70)
@@ -0,0 +1,131 @@
+import ast
+import numpy as np
+from market_store import INDEX_CODES
+
+
+def _tradable_rows(market, day_index):
+    """当天有净值数据的可交易基金行号"""
+    nav = market.nav[:, day_index]
+    return [
+        row for row, code in enumerate(market.codes)
+        if code not in INDEX_CODES and not np.isnan(nav[row])
+    ]
+
+
+def _rebalance_orders(market, day_index, cash, holdings, rows):
+    """生成将资产等权调整到指定基金的订单，先卖后买"""
+    nav = market.nav[:, day_index]
+    total = cash + np.nansum(holdings * nav)
+    target = np.zeros_like(holdings)
+    if rows:
+        target[rows] = total / len(rows) / nav[rows]
+
+    sells, buys = [], []
+    budget = cash
+    for row in np.flatnonzero(holdings > target):
+        shares = holdings[row] - target[row]
+        sells.append(('sell', market.codes[row], shares))
+        budget += shares * nav[row]
+    for row in rows:
+        amount = min((target[row] - holdings[row]) * nav[row], budget)
+        if amount > 0:
+            buys.append(('buy', market.codes[row], amount))
+            budget -= amount
+    return sells + buys
+
+
+def buy_and_hold():
+    """第一个交易日等权买入所有可交易基金并一直持有"""
+    state = {'started': False}
+
+    def strategy(day_index, market, cash, holdings):
+        if state['started']:
+            return []
+        state['started'] = True
+        rows = _tradable_rows(market, day_index)
+        return [('buy', market.codes[row], cash / len(rows)) for row in rows] if rows else []
+
+    return strategy
+
+
+def equal_weight(interval=20):
+    """每隔interval个交易日将资产等权再平衡到所有可交易基金"""
+    state = {'count': 0}
+
+    def strategy(day_index, market, cash, holdings):
+        state['count'] += 1
+        if (state['count'] - 1) % interval:
+            return []
+        return _rebalance_orders(market, day_index, cash, holdings, _tradable_rows(market, day_index))
+
+    return strategy
+
+
+def momentum(lookback=20, top=3, interval=20):
+    """每隔interval个交易日等权持有过去lookback个交易日涨幅最大的top只基金"""
+    state = {'count': 0}
+
+    def strategy(day_index, market, cash, holdings):
+        state['count'] += 1
+        if day_index < lookback or (state['count'] - 1) % interval:
+            return []
+        rows = _tradable_rows(market, day_index)
+        past = market.nav[rows, day_index - lookback]
+        returns = market.nav[rows, day_index] / past - 1
+        ranked = [rows[i] for i in np.argsort(-np.nan_to_num(returns, nan=-np.inf))[:top]]
+        return _rebalance_orders(market, day_index, cash, holdings, ranked)
+
+    return strategy
+
+
+def dca(amount=1000, interval=5):
+    """定投：每隔interval个交易日将amount元等分买入所有可交易基金"""
+    state = {'count': 0}
+
+    def strategy(day_index, market, cash, holdings):
+        state['count'] += 1
+        if (state['count'] - 1) % interval:
+            return []
+        rows = _tradable_rows(market, day_index)
+        budget = min(amount, cash)
+        if not rows or budget <= 0:
+            return []
+        return [('buy', market.codes[row], budget / len(rows)) for row in rows]
+
+    return strategy
+
+
+# 内置策略，名称 -> 策略工厂函数
+STRATEGIES = {
+    'buy_and_hold': buy_and_hold,
+    'equal_weight': equal_weight,
+    'momentum': momentum,
+    'dca': dca,
+}
+
+
+def build_strategy(spec):
+    """
+    根据策略描述创建策略函数
+
+    Args:
+        spec: 策略名称，可带参数，例如 'momentum:lookback=10,top=2'，参数值按Python字面量解析
+
+    Returns:
+        策略函数
+    """
+    name, _, params_str = spec.partition(':')
+    if name not in STRATEGIES:
+        raise ValueError(f"未知策略: {name}，可选策略: {', '.join(STRATEGIES)}")
+
+    params = {}
+    for item in filter(None, params_str.split(',')):
+        key, sep, value = (part.strip() for part in item.partition('='))
+        if not key.isidentifier() or not sep or not value:
+            raise ValueError(f"策略参数格式错误: {item}")
+        # 数字、布尔值等按Python字面量解析，其余按字符串传入
+        try:
+            params[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[key] = value
+    return STRATEGIES[name](**params)
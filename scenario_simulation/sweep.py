@@ -0,0 +1,73 @@
+import os
+import itertools
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from backtest_runner import BacktestRunner, load_scene
+from strategies import build_strategy
+
+# 工作进程内已加载的场景，每个进程每个场景只加载一次
+_runners = {}
+
+
+def _get_runner(scene_dir):
+    """获取当前进程中场景对应的回测引擎，首次使用时从内存映射缓存加载"""
+    if scene_dir not in _runners:
+        _runners[scene_dir] = BacktestRunner(scene_dir)
+    return _runners[scene_dir]
+
+
+def _run_task(scene_dir, strategy_spec, initial_capital):
+    """在工作进程中运行单个 场景×策略×初始资金 组合"""
+    try:
+        runner = _get_runner(scene_dir)
+        result = runner.run(build_strategy(strategy_spec), initial_capital)
+        if not result['success']:
+            return {'error': result['message']}
+
+        summary = runner.summarize(result)
+        summary.pop('initial_capital')
+        trade_count = summary.pop('trade_count')
+        summary.update({
+            'buy_count': trade_count['buy'],
+            'sell_count': trade_count['sell'],
+            'trade_count': trade_count['total'],
+            'rejected_orders': result['rejected_orders'],
+        })
+        return summary
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def run_sweep(scene_dirs, strategy_specs, capitals, max_workers=None):
+    """
+    并行运行多场景、多策略、多初始资金的回测组合
+
+    Args:
+        scene_dirs: 场景名称到场景目录的映射 {scene_name: scene_dir}
+        strategy_specs: 策略描述列表，例如 ['buy_and_hold', 'momentum:lookback=10']
+        capitals: 初始资金列表
+        max_workers: 进程数，默认使用所有CPU核心
+
+    Returns:
+        每个组合一行的汇总表 DataFrame
+    """
+    # 先在主进程中构建场景缓存，工作进程直接以只读方式内存映射同一份行情数组
+    for scene_dir in scene_dirs.values():
+        load_scene(scene_dir)
+
+    tasks = list(itertools.product(scene_dirs.items(), strategy_specs, capitals))
+    rows = []
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {
+            executor.submit(_run_task, str(scene_dir), spec, capital): (scene_name, spec, capital)
+            for (scene_name, scene_dir), spec, capital in tasks
+        }
+        for future in as_completed(futures):
+            scene_name, spec, capital = futures[future]
+            row = {'scene': scene_name, 'strategy': spec, 'capital': capital}
+            row.update(future.result())
+            rows.append(row)
+
+    results = pd.DataFrame(rows)
+    return results.sort_values(['scene', 'strategy', 'capital']).reset_index(drop=True)
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 测试中的模型响应缓存写入临时目录，不影响项目目录下的 .cache/llm
+os.environ.setdefault("LLM_CACHE_DIR", tempfile.mkdtemp(prefix="llm_cache_"))
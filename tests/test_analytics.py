@@ -0,0 +1,55 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# 场景模拟模块使用同目录的平铺导入
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenario_simulation"))
+import analytics
+from data_loader import DataLoader
+
+SCENE_2015 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "scene", "2015年中国股灾")
+
+NET_WORTH = [100.0, 110.0, 99.0, 121.0]
+
+
+def test_compute_metrics_on_known_series():
+    metrics = analytics.compute_metrics(NET_WORTH, 100.0, benchmark=[10.0, 11.0, 11.0, 12.1])
+    returns = np.array([0.1, -0.1, 22.0 / 99.0])
+    benchmark_returns = np.array([0.1, 0.0, 0.1])
+
+    assert metrics["total_return"] == pytest.approx(21.0)
+    assert metrics["max_drawdown"] == pytest.approx(10.0)
+    assert metrics["annual_return"] == pytest.approx((1.21 ** (252 / 3) - 1) * 100)
+    assert metrics["volatility"] == pytest.approx(returns.std(ddof=1) * np.sqrt(252) * 100)
+    assert metrics["sharpe_ratio"] == pytest.approx(returns.mean() / returns.std(ddof=1) * np.sqrt(252))
+    assert metrics["market_return"] == pytest.approx(21.0)
+    assert metrics["outperformance"] == pytest.approx(0.0)
+    assert metrics["tracking_error"] == pytest.approx((returns - benchmark_returns).std(ddof=1) * np.sqrt(252) * 100)
+
+
+def test_tracking_error_skips_missing_benchmark_days():
+    metrics = analytics.compute_metrics(NET_WORTH + [121.0], 100.0, benchmark=[10.0, 11.0, 11.0, 12.1, np.nan])
+    assert metrics["market_return"] == pytest.approx(21.0)
+    assert metrics["tracking_error"] is not None
+
+    metrics = analytics.compute_metrics(NET_WORTH, 100.0, benchmark=[np.nan] * 4)
+    assert metrics["market_return"] == 0.0
+    assert metrics["tracking_error"] is None
+
+
+def test_turnover_excludes_opening_allocation():
+    average_assets = np.mean(NET_WORTH)
+    # 只有建仓买入，没有换手
+    assert analytics.compute_metrics(NET_WORTH, 100.0, trade_amounts=[100.0])["turnover"] == 0.0
+    metrics = analytics.compute_metrics(NET_WORTH, 100.0, trade_amounts=[100.0, -50.0, 30.0])
+    assert metrics["turnover"] == pytest.approx(50.0 / average_assets * 100)
+
+
+@pytest.mark.skipif(not os.path.exists(SCENE_2015), reason="缺少2015年场景数据")
+def test_load_all_data_includes_benchmark_index():
+    data = DataLoader(SCENE_2015).load_all_data(use_cache=False)
+    assert "sh_index" in data["market"].code_index
+    benchmark = data["market"].series("sh_index", np.arange(len(data["market"])))
+    assert np.count_nonzero(~np.isnan(benchmark)) > 100
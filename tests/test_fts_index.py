@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from utils.fts_index import DocumentIndex, build_match_query, load_json_documents, split_keywords, tokenize
+
+CONTENTS = [
+    "近期A股市场震荡，沪深300指数小幅回落",
+    "散户炒股常见的心理误区",
+    "C类份额不收申购费，按日计提销售服务费",
+    "ETF基金适合长期定投",
+    "股票型基金的风险高于债券型基金",
+    "基金 定投的优势在于平滑成本",
+]
+
+# 文档名和章节标题中也包含关键词，只在正文中匹配时不应命中
+SOURCES = ["A股与C类份额入门.pdf", "基金定投手册.pdf"]
+SECTIONS = ["1、ETF基金与炒股", "2、股票型基金的风险", "3、债券与心理", "4、定投", "5、A股市场", "6、C类份额"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / "doc_library.json"
+    docs = [
+        {"source": SOURCES[i % len(SOURCES)], "section": SECTIONS[i], "content": content}
+        for i, content in enumerate(CONTENTS)
+    ]
+    path.write_text(json.dumps(docs, ensure_ascii=False), encoding="utf-8")
+    return DocumentIndex(str(path), load_json_documents, index_path=str(tmp_path / "doc_library.fts.db"))
+
+
+def substring_ids(keywords):
+    return {i + 1 for i, content in enumerate(CONTENTS) if any(kw in content for kw in keywords)}
+
+
+@pytest.mark.parametrize("query", ["A股", "股", "C类", "ETF", "基金", "定投", "炒股", "300", "心理，C类", "债券、A股"])
+def test_content_search_matches_substring(index, query):
+    hits = index.search(query, top_k=len(CONTENTS), columns=("content",))
+    assert {hit["id"] for hit in hits} == substring_ids(split_keywords(query))
+
+
+def test_default_search_also_matches_source_and_section(index):
+    assert {hit["id"] for hit in index.search("风险", top_k=len(CONTENTS), columns=("content",))} == {5}
+    assert {hit["id"] for hit in index.search("风险", top_k=len(CONTENTS))} == {2, 5}
+    assert {hit["id"] for hit in index.search("A股", top_k=len(CONTENTS))} == {1, 3, 5}
+
+
+def test_unknown_column_rejected():
+    with pytest.raises(ValueError):
+        build_match_query(["基金"], columns=("title",))
+
+
+def test_single_hanzi_at_end_of_run(index):
+    assert 2 in {hit["id"] for hit in index.search("股", top_k=len(CONTENTS), columns=("content",))}
+
+
+def test_keywords_split_on_commas_only():
+    assert split_keywords("A股， C类、基金 定投,") == ["A股", "C类", "基金 定投"]
+
+
+def test_tokenize_mixed_ascii_and_hanzi():
+    assert tokenize("近期A股，C类") == ["近", "期", "a", "股", "c", "类"]
+    assert build_match_query(["A股", "股"]) == '"a 股" OR "股"'
+    assert build_match_query(["A股"], columns=("content",)) == '{content} : "a 股"'
+
+
+def test_fallback_matches_any_adjacent_pair(index):
+    assert index.search("A股和C类有什么区别", columns=("content",)) == []
+    hits = index.search("A股和C类有什么区别", top_k=len(CONTENTS), fallback=True, columns=("content",))
+    assert {hit["id"] for hit in hits} == {1, 3}
+    assert build_match_query(["股"], any_token=True) == '"股"'
+
+
+def test_index_rebuilt_when_source_changes(index, tmp_path):
+    assert index.search("债券") != []
+    path = tmp_path / "doc_library.json"
+    path.write_text(json.dumps([{"source": "", "section": "", "content": "货币基金"}], ensure_ascii=False), encoding="utf-8")
+    assert index.search("债券") == []
+    assert [hit["id"] for hit in index.search("货币")] == [1]
@@ -0,0 +1,119 @@
+import asyncio
+import datetime
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "scene"))
+from fund_fetcher import FundHistoryFetcher
+
+# 服务端每页最多返回的条数，小于抓取器请求的page_size
+SERVER_PAGE_CAP = 3
+
+
+def make_records(count):
+    start = datetime.date(2020, 1, 1)
+    return [
+        {
+            "FSRQ": (start + datetime.timedelta(days=i)).isoformat(),
+            "DWJZ": f"{1 + i / 100:.4f}",
+            "LJJZ": f"{1 + i / 100:.4f}",
+            "JZZZL": "0.10",
+            "SGZT": "开放申购",
+            "SHZT": "开放赎回",
+        }
+        for i in reversed(range(count))
+    ]
+
+
+class StubServer:
+    def __init__(self):
+        """模拟lsjz接口的本地服务，记录每只基金收到的请求"""
+        self.funds = {"000001": make_records(7), "000002": make_records(2), "000003": make_records(2), "000004": [{"date": "2020-01-01"}]}
+        self.requests = []
+        self.failures = {"000002": 1}
+
+    async def handle(self, request):
+        code = request.query["fundCode"]
+        page = int(request.query["pageIndex"])
+        self.requests.append((code, page))
+        if self.failures.get(code):
+            self.failures[code] -= 1
+            return web.Response(status=503)
+
+        records = self.funds[code]
+        total = "abc" if code == "000003" else len(records)
+        page_records = records[(page - 1) * SERVER_PAGE_CAP:page * SERVER_PAGE_CAP]
+        body = {"Data": {"LSJZList": page_records}, "TotalCount": total}
+        return web.Response(text=f"jQuery123({json.dumps(body)})")
+
+
+async def run_fetcher(server, db_path, codes, **kwargs):
+    app = web.Application()
+    app.router.add_get("/lsjz", server.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        fetcher = FundHistoryFetcher(
+            db_path, "2020-01-01", "2020-12-31", base_url=f"http://127.0.0.1:{port}/lsjz",
+            rate=0, retries=3, backoff=0.01, timeout=5
+        )
+        return await fetcher.run(codes, **kwargs)
+    finally:
+        await runner.cleanup()
+
+
+def nav_dates(db_path, code):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[0] for row in conn.execute("SELECT date FROM fund_nav WHERE fund_code = ? ORDER BY date", (code,))]
+    finally:
+        conn.close()
+
+
+def test_fetch_paginates_retries_and_isolates_bad_funds(tmp_path):
+    server = StubServer()
+    db_path = tmp_path / "fund.db"
+    results = asyncio.run(run_fetcher(server, db_path, ["000001", "000002", "000003", "000004"]))
+    assert list(results) == ["000001", "000002", "000003", "000004"]
+
+    # 服务端每页只返回3条，7条记录按实际条数分3页抓取
+    assert results["000001"] == {"status": "fetched", "rows": 7, "message": ""}
+    assert sorted(page for code, page in server.requests if code == "000001") == [1, 2, 3]
+    assert nav_dates(db_path, "000001") == [record["FSRQ"] for record in reversed(make_records(7))]
+
+    # 503之后重试成功
+    assert results["000002"]["status"] == "fetched"
+    assert [page for code, page in server.requests if code == "000002"] == [1, 1]
+
+    # 格式错误的基金单独记录错误，不影响其他基金
+    assert results["000003"]["status"] == "error"
+    assert "格式错误" in results["000003"]["message"]
+    assert nav_dates(db_path, "000003") == []
+
+    # 记录缺少净值字段，写入数据库失败
+    assert results["000004"]["status"] == "error"
+    assert "保存基金 000004" in results["000004"]["message"]
+
+
+def test_resume_skips_completed_funds(tmp_path):
+    server = StubServer()
+    db_path = tmp_path / "fund.db"
+    asyncio.run(run_fetcher(server, db_path, ["000001", "000002"]))
+
+    server.requests.clear()
+    results = asyncio.run(run_fetcher(server, db_path, ["000001", "000002", "000003"]))
+    assert results["000001"]["status"] == results["000002"]["status"] == "skipped"
+    assert {code for code, page in server.requests} == {"000003"}
+
+    server.requests.clear()
+    results = asyncio.run(run_fetcher(server, db_path, ["000001"], resume=False))
+    assert results["000001"]["status"] == "fetched"
+    assert server.requests
@@ -0,0 +1,35 @@
+import sqlite3
+
+import pytest
+
+pytest.importorskip("autogen_agentchat")
+from analyze import learning_search
+from utils.fts_index import get_index, load_sqlite_documents
+
+DOCUMENTS = [
+    ("基金投资入门.pdf", "第一章 什么是基金", "基金是一种集合投资方式，由基金管理人统一管理。"),
+    ("基金投资入门.pdf", "第三章 基金定投", "定投是指定期定额买入基金，可以平滑成本，适合长期投资。"),
+    ("投资心理学.pdf", "第二章 追涨杀跌", "很多投资者在市场上涨时加大定投金额，下跌时停止扣款。"),
+    ("债券基础.pdf", "第一节 债券收益", "债券的收益来自票息和价格变动。"),
+]
+
+
+def test_search_learning_docs_reads_documents_table(tmp_path, monkeypatch):
+    db_path = tmp_path / "learning_docs.db"
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("CREATE TABLE documents (id INTEGER PRIMARY KEY, source TEXT, section TEXT, content TEXT)")
+        conn.executemany("INSERT INTO documents (source, section, content) VALUES (?, ?, ?)", DOCUMENTS)
+    conn.close()
+    monkeypatch.setattr(learning_search, "DB_PATH", str(db_path))
+
+    hits = learning_search.search_learning_docs("定投", top_k=2)
+
+    assert get_index(str(db_path), load_sqlite_documents).loader is load_sqlite_documents
+    # 章节标题和正文都包含关键词的文档排在前面，最多返回 top_k 条
+    assert [(hit["source"], hit["section"]) for hit in hits] == [
+        ("基金投资入门.pdf", "第三章 基金定投"),
+        ("投资心理学.pdf", "第二章 追涨杀跌"),
+    ]
+    assert hits[0]["content"] == DOCUMENTS[1][2]
+    assert hits[0]["score"] <= hits[1]["score"]
@@ -0,0 +1,56 @@
+import asyncio
+
+import diskcache
+import pytest
+
+pytest.importorskip("autogen_ext")
+from autogen_core.models import SystemMessage, UserMessage
+from autogen_ext.models.replay import ReplayChatCompletionClient
+from pydantic import BaseModel
+
+from utils.llm_cache import CachedModelClient, cache_key
+
+SYSTEM = SystemMessage(content="你是一位基金分析师")
+USER = UserMessage(content="分析用户的持仓", source="user")
+
+
+class Advice(BaseModel):
+    advice: str
+
+
+def test_cache_key_is_stable_for_equal_requests():
+    assert cache_key("deepseek-chat", [SYSTEM, USER]) == cache_key(
+        "deepseek-chat", [SystemMessage(content="你是一位基金分析师"), UserMessage(content="分析用户的持仓", source="user")]
+    )
+    assert cache_key("m", [USER], extra_create_args={"temperature": 0, "top_p": 1}) == cache_key(
+        "m", [USER], extra_create_args={"top_p": 1, "temperature": 0}
+    )
+
+
+@pytest.mark.parametrize("changed", [
+    {"model": "other-model"},
+    {"messages": [SystemMessage(content="你是一位学习助理"), USER]},
+    {"messages": [SYSTEM, UserMessage(content="分析用户的收益", source="user")]},
+    {"messages": [USER]},
+    {"json_output": True},
+    {"json_output": Advice},
+    {"tools": [{"name": "fetch_many", "parameters": {}}]},
+    {"extra_create_args": {"temperature": 0.5}},
+])
+def test_cache_key_changes_with_request_fields(changed):
+    request = {"model": "deepseek-chat", "messages": [SYSTEM, USER]}
+    assert cache_key(**request) != cache_key(**{**request, **changed})
+
+
+def test_cached_client_serves_repeated_request(tmp_path):
+    replay = ReplayChatCompletionClient(["第一次回复", "第二次回复"])
+    client = CachedModelClient(replay, model="deepseek-chat", cache=diskcache.Cache(str(tmp_path)))
+
+    first = asyncio.run(client.create([SYSTEM, USER]))
+    second = asyncio.run(client.create([SYSTEM, USER]))
+    third = asyncio.run(client.create([SYSTEM, UserMessage(content="分析用户的收益", source="user")]))
+
+    assert first.content == second.content == "第一次回复"
+    assert second.cached and second.usage.prompt_tokens == 0
+    assert third.content == "第二次回复"
+    assert client.stats()["hits"] == 1 and client.stats()["misses"] == 2
@@ -0,0 +1,75 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 场景模拟模块使用同目录的平铺导入
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenario_simulation"))
+from data_loader import DataLoader
+from market_store import MarketStore
+
+SCENE_2015 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "scene", "2015年中国股灾")
+
+
+def legacy_fund_info(funds_data, fund_code, date):
+    """原先按日期逐行筛选DataFrame的查询方式"""
+    fund_data = funds_data[fund_code]
+    day_data = fund_data[fund_data['date'].dt.date == date]
+    if day_data.empty:
+        return None
+    day_info = {}
+    if 'DWJZ' in day_data.columns:
+        day_info['nav'] = float(day_data['DWJZ'].values[0])
+    if 'JZZZL' in day_data.columns:
+        day_info['change_pct'] = float(day_data['JZZZL'].values[0])
+    return day_info
+
+
+@pytest.fixture
+def store():
+    dates = pd.to_datetime(["2015-01-05", "2015-01-06", "2015-01-08"])
+    nav = pd.DataFrame({"000001": [1.0, 1.1, np.nan], "sh_index": [3300.0, 3350.0, 3400.0]}, index=dates)
+    change = pd.DataFrame({"000001": [0.0, 10.0, np.nan], "sh_index": [np.nan, 1.5, 1.49]}, index=dates)
+    return MarketStore.from_matrices(nav, change, dates)
+
+
+def test_lookups(store):
+    assert store.get("000001", 1) == {"nav": 1.1, "change_pct": 10.0}
+    assert store.get("000001", 2) is None
+    assert store.get("sh_index", 0) == {"close": 3300.0}
+    assert store.get("missing", 0) is None
+
+    assert store.index_of(datetime.date(2015, 1, 6)) == 1
+    assert store.index_of(datetime.date(2015, 1, 7)) == -1
+    assert store.index_on_or_before(datetime.date(2015, 1, 7)) == 1
+    assert store.index_on_or_after(datetime.date(2015, 1, 7)) == 2
+    assert store.index_on_or_before(datetime.date(2015, 1, 1)) == -1
+    assert store.index_on_or_after(datetime.date(2015, 2, 1)) == 3
+
+    np.testing.assert_array_equal(store.series("sh_index", [0, -1, 2]), [3300.0, np.nan, 3400.0])
+    assert store.first_last("000001") == (1.0, 1.1)
+
+
+def test_save_and_load_round_trip(store, tmp_path):
+    store.save(tmp_path)
+    loaded = MarketStore.load(tmp_path, store.codes)
+    assert [loaded.date_at(i) for i in range(len(loaded))] == [store.date_at(i) for i in range(len(store))]
+    assert all(loaded.snapshot(i) == store.snapshot(i) for i in range(len(store)))
+
+
+@pytest.mark.skipif(not os.path.exists(SCENE_2015), reason="缺少2015年场景数据")
+def test_matches_legacy_dataframe_lookups():
+    loader = DataLoader(SCENE_2015)
+    loader.simulation_start_date = loader.get_earliest_valid_date()
+    loader.load_fund_data()
+    loader.load_news_data()
+    loader.build_timeline()
+
+    fund_codes = [code for code, df in loader.funds_data.items() if not df.empty and code not in ("sh_index", "dj_index")]
+    for index in range(0, len(loader.market), 7):
+        date = loader.market.date_at(index)
+        for code in fund_codes:
+            assert loader.market.get(code, index) == legacy_fund_info(loader.funds_data, code, date)
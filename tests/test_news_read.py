@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("autogen_agentchat")
+from news_cognitive import news_read
+
+
+def make_items(count):
+    return [
+        {"title": f"新闻{i}", "link": f"https://example.com/{i}", "source": "来源", "date": "2025-05-03"}
+        for i in range(count)
+    ]
+
+
+def test_batch_articles_respects_token_and_count_limits():
+    articles = [{**item, "content": "字" * 900} for item in make_items(12)]
+    batches = news_read.batch_articles(articles, max_tokens=3500, max_articles=5)
+    assert [len(batch) for batch in batches] == [3, 3, 3, 3]
+    assert [a for batch in batches for a in batch] == articles
+
+    batches = news_read.batch_articles(articles, max_tokens=100000, max_articles=5)
+    assert [len(batch) for batch in batches] == [5, 5, 2]
+
+
+def test_news_analyze_keeps_results_of_successful_batches(monkeypatch):
+    items = make_items(7)
+
+    async def fake_fetch_many(urls, maxlen):
+        return {url: {"ok": not url.endswith("/6"), "text": "正文"} for url in urls}
+
+    async def fake_analyze_batch(articles):
+        if any(a["link"].endswith("/0") for a in articles):
+            raise RuntimeError("上下文超出长度")
+        return {a["link"]: {"link": a["link"], "summary": "总结", "impact": "影响"} for a in articles}
+
+    monkeypatch.setattr(news_read, "fetch_many", fake_fetch_many)
+    monkeypatch.setattr(news_read, "analyze_batch", fake_analyze_batch)
+
+    # 每篇新闻约100个字符，每批2篇
+    result = asyncio.run(news_read.news_analyze(items, max_tokens=250))
+    assert [item["link"] for item in result] == [f"https://example.com/{i}" for i in (2, 3, 4, 5)]
+    assert all(item["summary"] == "总结" for item in result)
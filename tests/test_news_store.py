@@ -0,0 +1,49 @@
+import json
+import threading
+
+from news_cognitive.news_store import NewsStore, news_id
+from utils.system_file import file_lock, read_index, save_document
+
+
+def make_records(links):
+    return [{"title": f"标题{link}", "link": link, "date": "2025-05-03", "summary": "总结", "impact": "影响"} for link in links]
+
+
+def test_append_writes_documents_through_shared_index(tmp_path):
+    store = NewsStore(str(tmp_path))
+    written = store.append(make_records(["https://a", "https://b"]))
+    assert written == [news_id("https://a"), news_id("https://b")]
+
+    entries = read_index(str(tmp_path))
+    assert [entry["link"] for entry in entries] == ["https://a", "https://b"]
+    assert all(entry["kind"] == "news" and entry["file"].startswith("news_") for entry in entries)
+    assert sorted(p.name for p in tmp_path.iterdir() if p.suffix == ".jsonl") == ["index.jsonl"]
+
+    record = NewsStore(str(tmp_path)).get(news_id("https://b"))
+    assert record["link"] == "https://b" and record["summary"] == "总结"
+
+
+def test_append_skips_saved_links(tmp_path):
+    store = NewsStore(str(tmp_path))
+    store.append(make_records(["https://a"]))
+    assert store.append(make_records(["https://a", "https://c"])) == [news_id("https://c")]
+    assert NewsStore(str(tmp_path)).contains("https://c")
+
+
+def test_concurrent_appends_store_each_link_once(tmp_path):
+    links = [f"https://news/{i}" for i in range(20)]
+    threads = [threading.Thread(target=NewsStore(str(tmp_path)).append, args=(make_records(links),)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(entry["link"] for entry in read_index(str(tmp_path))) == sorted(links)
+
+
+def test_file_lock_is_reentrant(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    with file_lock(path):
+        with file_lock(path):
+            entry = save_document({"a": 1}, str(tmp_path), kind="analysis")
+    assert entry["created"]
+    assert json.loads((tmp_path / entry["file"]).read_text(encoding="utf-8")) == {"a": 1}
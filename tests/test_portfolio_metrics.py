@@ -0,0 +1,72 @@
+import datetime
+import json
+import sqlite3
+
+import pytest
+
+from analyze.portfolio_metrics import calculate_portfolio_metrics
+from analyze.portfolio_repository import PortfolioRepository
+from utils import calculator_tool
+
+NOW = datetime.datetime(2024, 6, 30, 12, 0, 0)
+
+USERS = [
+    ("u001", "张三", "中", "退休规划", "成长型"),
+    ("u002", "李四", "低", "教育金", "收入型"),
+    ("u003", "王五", "高", "财富增值", "成长型"),
+]
+FUNDS = [
+    ("f001", "沪深300指数A", "110020", "指数型", "中高", 1.52),
+    ("f002", "纯债债券A", "000186", "债券型", "低", 1.08),
+    ("f003", "货币基金", "000198", "货币市场型", "低", 1.0),
+    ("f004", "不动产REITs", "508000", "REITs", "中", 3.2),
+]
+BEHAVIORS = [
+    ("b001", "u001", "f001", "申购", 10000.0, "2023-01-05 10:00:00", 1.40, 7142.86, "银行APP", "已确认"),
+    ("b002", "u001", "f002", "定投", 5000.0, "2023-03-01 09:30:00", 1.05, 4761.90, "支付宝", "已确认"),
+    ("b003", "u001", "f004", "申购", 3000.0, "2023-06-15 14:00:00", 3.0, 1000.0, None, "已确认"),
+    ("b004", "u002", "f003", "申购", 20000.0, "2024-02-01 11:00:00", 1.0, 20000.0, "天天基金", "已确认"),
+    ("b005", "u002", "f002", "申购", 8000.0, "2024-05-20 15:00:00", 1.06, 7547.17, "天天基金", "处理中"),
+]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    db_path = tmp_path / "fund_investment.db"
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("CREATE TABLE users (user_id TEXT PRIMARY KEY, username TEXT, risk_tolerance TEXT, investment_goal TEXT, investment_preference TEXT)")
+        conn.execute("CREATE TABLE funds (fund_id TEXT PRIMARY KEY, fund_name TEXT, fund_code TEXT, fund_type TEXT, risk_level TEXT, current_nav REAL)")
+        conn.execute(
+            "CREATE TABLE investment_behaviors (behavior_id TEXT PRIMARY KEY, user_id TEXT, fund_id TEXT, action_type TEXT, amount REAL,"
+            " timestamp TEXT, nav_price REAL, fund_shares REAL, platform TEXT, transaction_status TEXT)"
+        )
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)", USERS)
+        conn.executemany("INSERT INTO funds VALUES (?, ?, ?, ?, ?, ?)", FUNDS)
+        conn.executemany("INSERT INTO investment_behaviors VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", BEHAVIORS)
+    conn.close()
+    repository = PortfolioRepository(str(db_path))
+    yield repository
+    repository.close()
+
+
+class FixedDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+def test_batch_metrics_match_single_user_analysis(repository, monkeypatch):
+    monkeypatch.setattr(calculator_tool, "datetime", FixedDatetime)
+
+    batch = calculate_portfolio_metrics(repository.all_records_frame(), now=NOW)
+
+    assert list(batch) == ["u001", "u002", "u003"]
+    for user_id in batch:
+        records = repository.get_portfolio_records(user_id)
+        expected = json.loads(calculator_tool.calculate_portfolio_analysis(json.dumps(records, ensure_ascii=False)))
+        assert batch[user_id] == expected
+    # 未知基金类型归入“其他”，缺失的交易平台归入“未知平台”
+    assert batch["u001"]["资产配置比例"]["按资产类型"]["其他"] > 0
+    assert "未知平台" in batch["u001"]["资产配置比例"]["按投资平台"]
+    assert batch["u003"] == {"error": "未找到投资记录"}
@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "scene"))
+import scene_builder
+
+HEADER = "FSRQ,DWJZ,LJJZ,JZZZL,SGZT,SHZT\n"
+
+
+def nav_row(day, nav):
+    return f"2015-01-{day:02d},{nav:.4f},{nav:.4f},0.10,开放申购,开放赎回\n"
+
+
+@pytest.fixture
+def scene(tmp_path):
+    scene_dir = tmp_path / "测试场景"
+    scene_dir.mkdir()
+    config = {"funds": {"000001": "测试基金"}, "indices": {}, "cache": False}
+    (scene_dir / scene_builder.CONFIG_NAME).write_text(json.dumps(config, ensure_ascii=False), encoding="utf-8")
+    # CSV按日期倒序排列，与天天基金导出的格式一致
+    write_csv(scene_dir, [(6, 1.02), (5, 1.01)])
+    return scene_dir
+
+
+def write_csv(scene_dir, rows):
+    text = HEADER + "".join(nav_row(day, nav) for day, nav in rows)
+    (scene_dir / "000001_2015_history.csv").write_text(text, encoding="utf-8")
+
+
+def create_db(scene_dir, incremental=True):
+    config = scene_builder.load_config(scene_dir)
+    return scene_builder.create_db(scene_dir, config, scene_dir / "fund.db", incremental=incremental)
+
+
+def nav_dates(scene_dir):
+    conn = sqlite3.connect(scene_dir / "fund.db")
+    try:
+        return [row[0] for row in conn.execute("SELECT date FROM fund_nav ORDER BY date")]
+    finally:
+        conn.close()
+
+
+def test_unchanged_file_is_skipped(scene):
+    assert create_db(scene) == 2
+    assert create_db(scene) == 0
+
+
+def test_only_rows_after_high_water_mark_are_written(scene):
+    create_db(scene)
+    write_csv(scene, [(8, 1.04), (7, 1.03), (6, 1.02), (5, 1.01)])
+    assert create_db(scene) == 2
+    assert nav_dates(scene) == ["2015-01-05", "2015-01-06", "2015-01-07", "2015-01-08"]
+
+    conn = sqlite3.connect(scene / "fund.db")
+    max_date, row_count = conn.execute("SELECT max_date, row_count FROM ingest_state WHERE source = 'fund_nav/000001'").fetchone()
+    conn.close()
+    assert (max_date, row_count) == ("2015-01-08", 4)
+
+
+def test_changed_history_reimports_whole_file(scene):
+    create_db(scene)
+    write_csv(scene, [(7, 1.03), (6, 1.02), (5, 0.99)])
+    assert create_db(scene) == 3
+
+
+def test_full_import_ignores_ingest_state(scene):
+    create_db(scene)
+    assert create_db(scene, incremental=False) == 2
+
+
+def test_build_scene_skips_unchanged_inputs(scene):
+    assert scene_builder.build_scene(scene)["status"] == "built"
+    assert scene_builder.build_scene(scene)["status"] == "skipped"
+    write_csv(scene, [(7, 1.03), (6, 1.02), (5, 1.01)])
+    result = scene_builder.build_scene(scene)
+    assert result["status"] == "built" and "写入 1 条记录" in result["message"]
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenario_simulation"))
+import strategies
+
+
+def test_build_strategy_parses_literal_and_string_params(monkeypatch):
+    monkeypatch.setitem(strategies.STRATEGIES, "record", lambda **params: params)
+
+    params = strategies.build_strategy("record: lookback = 10,ratio=0.5,weekly=True,mode=fast")
+
+    assert params == {"lookback": 10, "ratio": 0.5, "weekly": True, "mode": "fast"}
+    assert callable(strategies.build_strategy("momentum:lookback=10,top=2"))
+
+
+@pytest.mark.parametrize("spec, item", [
+    ("momentum:top=", "top="),
+    ("momentum:top", "top"),
+    ("momentum:=3", "=3"),
+])
+def test_build_strategy_rejects_malformed_params(spec, item):
+    with pytest.raises(ValueError, match=f"策略参数格式错误: {item}$"):
+        strategies.build_strategy(spec)
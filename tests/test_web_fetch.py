@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import diskcache
+import pytest
+
+from utils import web_fetch
+
+
+class FakeResponse:
+    def __init__(self, html, status_code=200, headers=None, chunk_delay=0.0):
+        self.html = html
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self.url = "https://example.com"
+        self.chunk_delay = chunk_delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_content(self, chunk_size):
+        if not self.chunk_delay:
+            yield self.html.encode("utf-8")
+            return
+        # 服务器持续缓慢地发送数据，每个片段都在requests的单次读取超时之内
+        while True:
+            time.sleep(self.chunk_delay)
+            yield b"<p>..."
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise web_fetch.requests.HTTPError(f"{self.status_code}")
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append(dict(headers))
+        if "slow" in url:
+            return FakeResponse("", chunk_delay=0.05)
+        language = headers.get("Accept-Language", "")
+        return FakeResponse(f"<html><body><p>{url} {language}</p></body></html>")
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(web_fetch, "_cache", diskcache.Cache(str(tmp_path / "cache")))
+    monkeypatch.setattr(web_fetch, "get_session", lambda: session)
+    return session
+
+
+def test_repeated_fetch_served_from_cache(session):
+    first = web_fetch.fetch_text_from_url("https://example.com/a")
+    second = web_fetch.fetch_text_from_url("https://example.com/a")
+    assert first == second
+    assert len(session.calls) == 1
+
+
+def test_cache_key_depends_on_headers(session):
+    english = web_fetch.fetch_text_from_url("https://example.com/a", headers={"Accept-Language": "en"})
+    chinese = web_fetch.fetch_text_from_url("https://example.com/a", headers={"Accept-Language": "zh-CN"})
+    assert english.endswith("en") and chinese.endswith("zh-CN")
+    assert len(session.calls) == 2
+
+    # 请求头名称不区分大小写
+    assert web_fetch.fetch_text_from_url("https://example.com/a", headers={"accept-language": "en"}) == english
+    assert len(session.calls) == 2
+
+
+def test_slow_body_stops_at_deadline(session):
+    started = time.monotonic()
+    text = web_fetch.fetch_text_from_url("https://slow.example.com/a", timeout=0.3)
+    assert text.startswith("请求错误:")
+    assert time.monotonic() - started < 1
+
+
+def test_fetch_many_does_not_leave_worker_threads_running(session):
+    started = time.monotonic()
+    # asyncio.run 退出前会等待线程池中的线程结束，线程如果继续读取响应这里会一直阻塞
+    results = asyncio.run(web_fetch.fetch_many(
+        ["https://slow.example.com/a", "https://slow.example.com/b", "https://example.com/c"], timeout=0.3
+    ))
+    assert [result["ok"] for result in results.values()] == [False, False, True]
+    assert time.monotonic() - started < 1
@@ -255,26 +255,26 @@ def calculate_portfolio_analysis(investment_data_str):
         fund_info = record.get("fund_info", {})
         transaction_info = record.get("transaction_info", {})
         
-        # 安全地提取需要的数值，提供默认值防止数据异常
-        current_nav = float(fund_info.get("current_nav", 0))
-        fund_shares = float(transaction_info.get("fund_shares", 0))
+        # 安全地提取需要的数值，提供默认值防止数据异常（数据库中的NULL与缺失字段同样处理）
+        current_nav = float(fund_info.get("current_nav") or 0)
+        fund_shares = float(transaction_info.get("fund_shares") or 0)
         
         # 计算当前持仓价值 (当前净值 * 持有份额)
         current_value = current_nav * fund_shares
         total_asset_value += current_value
         
         # 按资产类型分类
-        fund_type = fund_info.get("fund_type", "其他")
+        fund_type = fund_info.get("fund_type") or "其他"
         asset_type = fund_type_to_asset.get(fund_type, "其他")
         asset_type_values[asset_type] += current_value
         
         # 按风险等级分类
-        risk_level_raw = fund_info.get("risk_level", "中")
+        risk_level_raw = fund_info.get("risk_level") or "中"
         risk_level = risk_level_map.get(risk_level_raw, "中风险")
         risk_level_values[risk_level] += current_value
         
         # 按投资平台分类
-        platform = transaction_info.get("platform", "未知平台")
+        platform = transaction_info.get("platform") or "未知平台"
         platform_values[platform] += current_value
         
         # 记录交易日期和初始投资金额
@@ -289,7 +289,7 @@ def calculate_portfolio_analysis(investment_data_str):
             pass
         
         # 累计初始投资金额
-        amount = float(transaction_info.get("amount", 0))
+        amount = float(transaction_info.get("amount") or 0)
         total_initial_investment += amount
     
     # 计算各类资产占比百分比
@@ -0,0 +1,220 @@
+import os
+import re
+import json
+import sqlite3
+import pathlib
+import tempfile
+import threading
+
+# 索引格式版本，修改分词方式或表结构时递增，旧索引会自动重建
+INDEX_VERSION = 2
+# 索引的列及各列的BM25权重
+COLUMNS = ("source", "section", "content")
+BM25_WEIGHTS = (1.0, 2.0, 1.0)
+
+# 查询关键词的分隔符：逗号和顿号，与原先逐条子串匹配时的拆分方式一致
+_KEYWORD_SPLIT_RE = re.compile(r"[,，、]")
+
+
+def tokenize(text: str) -> list:
+    """
+    将文本切分为索引词
+
+    每个汉字、字母、数字单独作为一个词（字母转为小写），标点和空白忽略；
+    关键词按字切分后作为短语查询，相邻的字必须连续出现，等价于子串匹配，
+    中英文混排的词（如“A股”“C类”）和单个汉字都能命中
+    """
+    return [char.lower() for char in (text or "") if char.isalnum()]
+
+
+def split_keywords(query: str) -> list:
+    """按逗号、顿号拆分查询关键词，去掉首尾空白"""
+    return [kw.strip() for kw in _KEYWORD_SPLIT_RE.split(query or "") if kw.strip()]
+
+
+def _phrase(tokens) -> str:
+    return '"' + " ".join(tokens) + '"'
+
+
+def build_match_query(keywords: list, any_token: bool = False, columns=None) -> str:
+    """
+    将关键词转换为FTS5查询，每个关键词作为一个短语，关键词之间为 OR
+
+    any_token 为True时不要求整个关键词连续出现，关键词中任意相邻两个字命中即可
+    （单字关键词仍按该字匹配），由BM25决定排序，适合整句提问；
+    columns 指定时只在这些列中匹配，例如 ("content",)，默认匹配所有列
+    """
+    if columns:
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"未知的索引列: {sorted(unknown)}")
+    clauses = []
+    for keyword in keywords:
+        tokens = tokenize(keyword)
+        if any_token and len(tokens) > 1:
+            clauses.extend(_phrase(tokens[i:i + 2]) for i in range(len(tokens) - 1))
+        elif tokens:
+            clauses.append(_phrase(tokens))
+    if columns:
+        scope = "{" + " ".join(columns) + "}"
+        clauses = [f"{scope} : {clause}" for clause in clauses]
+    return " OR ".join(dict.fromkeys(clauses))
+
+
+def load_json_documents(path: str):
+    """从 doc_library.json 读取文档 [{"source", "section", "content"}, ...]"""
+    with open(path, "r", encoding="utf-8") as f:
+        docs = json.load(f)
+    for i, doc in enumerate(docs):
+        yield i + 1, doc.get("source"), doc.get("section"), doc.get("content", "")
+
+
+def load_sqlite_documents(path: str):
+    """从学习资料数据库的 documents(id, source, section, content) 表读取文档"""
+    conn = sqlite3.connect(pathlib.Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        yield from conn.execute("SELECT id, source, section, content FROM documents ORDER BY id")
+    finally:
+        conn.close()
+
+
+class DocumentIndex:
+    def __init__(self, source_path: str, loader, index_path: str = None):
+        """
+        学习资料的全文索引
+
+        索引保存在源文件旁的 <源文件名>.fts.db 中，包含文档原文表 docs 和
+        FTS5虚拟表 docs_fts(source, section, content)；首次查询时打开，
+        源文件的大小或修改时间变化后自动重建，其余查询直接复用连接
+
+        参数:
+            source_path (str): 文档源文件（doc_library.json 或 learning_docs.db）
+            loader (callable): 读取源文件，返回 (id, source, section, content) 的可迭代对象
+            index_path (str, optional): 索引文件路径
+        """
+        self.source_path = os.path.abspath(source_path)
+        self.loader = loader
+        self.index_path = index_path or os.path.splitext(self.source_path)[0] + ".fts.db"
+        self._conn = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _source_signature(self) -> str:
+        stat = os.stat(self.source_path)
+        return f"{INDEX_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _read_signature(self, conn: sqlite3.Connection):
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        return row[0] if row else None
+
+    def _build(self, signature: str):
+        """从源文件重建索引，先写入临时文件再替换，其他进程不会读到写了一半的索引"""
+        directory = os.path.dirname(self.index_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".fts.db")
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(tmp_path)
+            with conn:
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute("CREATE TABLE docs (id INTEGER PRIMARY KEY, source TEXT, section TEXT, content TEXT)")
+                conn.execute("CREATE VIRTUAL TABLE docs_fts USING fts5(source, section, content, tokenize='unicode61')")
+                conn.execute("INSERT INTO docs_fts(docs_fts, rank) VALUES ('rank', ?)", (f"bm25({', '.join(map(str, BM25_WEIGHTS))})",))
+
+                docs = list(self.loader(self.source_path))
+                conn.executemany("INSERT INTO docs VALUES (?, ?, ?, ?)", docs)
+                conn.executemany(
+                    "INSERT INTO docs_fts(rowid, source, section, content) VALUES (?, ?, ?, ?)",
+                    (
+                        (doc_id, " ".join(tokenize(source)), " ".join(tokenize(section)), " ".join(tokenize(content)))
+                        for doc_id, source, section, content in docs
+                    ),
+                )
+                conn.execute("INSERT INTO docs_fts(docs_fts) VALUES ('optimize')")
+                conn.execute("INSERT INTO meta VALUES ('signature', ?)", (signature,))
+            conn.close()
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        print(f"已重建全文索引: {self.index_path} ({len(docs)} 条文档)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """返回与源文件一致的索引连接，必要时重建索引"""
+        signature = self._source_signature()
+        if self._conn is not None and self._signature == signature:
+            return self._conn
+
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+        if os.path.exists(self.index_path):
+            conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            if self._read_signature(conn) == signature:
+                self._conn, self._signature = conn, signature
+                return conn
+            conn.close()
+
+        self._build(signature)
+        self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self._signature = signature
+        return self._conn
+
+    def _query(self, match: str, top_k: int) -> list:
+        with self._lock:
+            return self._connect().execute(
+                """
+                SELECT d.id, d.source, d.section, d.content, docs_fts.rank
+                FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid
+                WHERE docs_fts MATCH ?
+                ORDER BY docs_fts.rank, d.id
+                LIMIT ?
+                """,
+                (match, top_k),
+            ).fetchall()
+
+    def search(self, keywords, top_k: int = 5, fallback: bool = False, columns=None) -> list:
+        """
+        按BM25相关度检索文档
+
+        参数:
+            keywords (str | list): 关键词列表，或用逗号、顿号分隔的查询字符串
+            top_k (int): 返回的最大条数
+            fallback (bool): 关键词短语没有命中时，改为按关键词中任意相邻两个字检索，适合整句提问
+            columns (tuple, optional): 只在这些列中匹配，如 ("content",) 与逐条检查正文子串的结果一致；
+                默认同时匹配 source、section 和 content
+
+        返回:
+            list: [{"id", "source", "section", "content", "score"}, ...]，按相关度从高到低排列，
+                  score 为BM25得分，越小越相关
+        """
+        if isinstance(keywords, str):
+            keywords = split_keywords(keywords)
+        match = build_match_query(keywords, columns=columns)
+        if not match:
+            return []
+
+        rows = self._query(match, top_k)
+        if not rows and fallback:
+            rows = self._query(build_match_query(keywords, any_token=True, columns=columns), top_k)
+        return [
+            {"id": doc_id, "source": source, "section": section, "content": content, "score": score}
+            for doc_id, source, section, content, score in rows
+        ]
+
+
+_indexes = {}
+_indexes_guard = threading.Lock()
+
+
+def get_index(source_path: str, loader) -> DocumentIndex:
+    """获取源文件对应的共享索引，同一文件在进程内只打开一次"""
+    key = os.path.abspath(source_path)
+    with _indexes_guard:
+        if key not in _indexes:
+            _indexes[key] = DocumentIndex(key, loader)
+        return _indexes[key]
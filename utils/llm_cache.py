@@ -0,0 +1,182 @@
+import os
+import json
+import hashlib
+import threading
+import diskcache
+from autogen_core.models import ChatCompletionClient, CreateResult, RequestUsage, SystemMessage
+from pydantic import BaseModel
+
+# 模型响应缓存目录，可通过环境变量 LLM_CACHE_DIR 修改
+CACHE_DIR = os.environ.get(
+    "LLM_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "llm")
+)
+# 缓存条目的默认保留时间（秒）
+CACHE_EXPIRE_SECONDS = 7 * 24 * 3600
+# 缓存总大小上限，超出后淘汰最近最少使用的条目
+CACHE_SIZE_LIMIT = 256 * 1024 * 1024
+# 缓存键格式版本，修改键的组成方式时递增
+KEY_VERSION = 1
+
+_caches = {}
+_lock = threading.Lock()
+
+
+def get_cache(directory: str = CACHE_DIR, size_limit: int = CACHE_SIZE_LIMIT) -> diskcache.Cache:
+    """获取磁盘响应缓存，同一目录只打开一次"""
+    with _lock:
+        if directory not in _caches:
+            _caches[directory] = diskcache.Cache(
+                directory,
+                size_limit=size_limit,
+                eviction_policy='least-recently-used'
+            )
+        return _caches[directory]
+
+
+def _tool_schema(tool) -> dict:
+    return tool.schema if hasattr(tool, "schema") else dict(tool)
+
+
+def _json_output_key(json_output):
+    if isinstance(json_output, type) and issubclass(json_output, BaseModel):
+        return json_output.model_json_schema()
+    return json_output
+
+
+def cache_key(model: str, messages, tools=(), json_output=None, extra_create_args=None) -> str:
+    """
+    根据模型、系统消息、对话消息和工具计算缓存键
+
+    返回:
+        str: 请求内容的SHA-256摘要，内容相同的请求得到相同的键
+    """
+    dumped = [message.model_dump(mode="json") for message in messages]
+    payload = {
+        "version": KEY_VERSION,
+        "model": model,
+        "system": [m["content"] for m, message in zip(dumped, messages) if isinstance(message, SystemMessage)],
+        "messages": [m for m, message in zip(dumped, messages) if not isinstance(message, SystemMessage)],
+        "tools": [_tool_schema(tool) for tool in tools],
+        "json_output": _json_output_key(json_output),
+        "extra_create_args": dict(extra_create_args or {}),
+    }
+    data = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class CachedModelClient(ChatCompletionClient):
+    def __init__(self, client: ChatCompletionClient, model: str = None, cache: diskcache.Cache = None, expire: float = CACHE_EXPIRE_SECONDS):
+        """
+        为模型客户端加上按请求内容寻址的响应缓存
+
+        相同模型、消息、工具和生成参数的请求直接返回缓存的结果，不再调用模型，
+        返回结果的 cached 字段为 True、token用量为0；失败的请求不会被缓存
+
+        可以包装任意 ChatCompletionClient，例如用 autogen_ext.models.replay.ReplayChatCompletionClient
+        作为本地替身模型验证缓存行为
+
+        参数:
+            client (ChatCompletionClient): 被包装的模型客户端，如 get_model_client() 的结果
+            model (str, optional): 参与缓存键计算的模型名，默认取 client.model
+            cache (diskcache.Cache, optional): 缓存存储，默认使用 CACHE_DIR 下的磁盘缓存
+            expire (float): 缓存条目的保留时间（秒），None表示不过期
+        """
+        self.client = client
+        self.model = model or getattr(client, "model", None) or type(client).__name__
+        self.cache = cache if cache is not None else get_cache()
+        self.expire = expire
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, messages, tools, json_output, extra_create_args) -> str:
+        return cache_key(self.model, messages, tools, json_output, extra_create_args)
+
+    def _lookup(self, key: str):
+        data = self.cache.get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # 命中缓存的请求没有消耗token
+        result = CreateResult.model_validate_json(data)
+        result.cached = True
+        result.usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        return result
+
+    def _store(self, key: str, result: CreateResult):
+        self.cache.set(key, result.model_dump_json(), expire=self.expire)
+
+    async def create(self, messages, *, tools=[], json_output=None, extra_create_args={}, cancellation_token=None):
+        key = self._key(messages, tools, json_output, extra_create_args)
+        result = self._lookup(key)
+        if result is not None:
+            return result
+
+        result = await self.client.create(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        )
+        self._store(key, result)
+        return result
+
+    async def create_stream(self, messages, *, tools=[], json_output=None, extra_create_args={}, cancellation_token=None):
+        key = self._key(messages, tools, json_output, extra_create_args)
+        result = self._lookup(key)
+        if result is not None:
+            # 缓存命中时先输出完整文本，再输出结果，与流式接口的约定一致
+            if isinstance(result.content, str):
+                yield result.content
+            yield result
+            return
+
+        async for chunk in self.client.create_stream(
+            messages,
+            tools=tools,
+            json_output=json_output,
+            extra_create_args=extra_create_args,
+            cancellation_token=cancellation_token,
+        ):
+            if isinstance(chunk, CreateResult):
+                self._store(key, chunk)
+            yield chunk
+
+    def stats(self) -> dict:
+        """返回缓存命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "entries": len(self.cache),
+                "size": self.cache.volume(),
+            }
+
+    async def close(self):
+        await self.client.close()
+
+    def actual_usage(self):
+        return self.client.actual_usage()
+
+    def total_usage(self):
+        return self.client.total_usage()
+
+    def count_tokens(self, messages, **kwargs) -> int:
+        return self.client.count_tokens(messages, **kwargs)
+
+    def remaining_tokens(self, messages, **kwargs) -> int:
+        return self.client.remaining_tokens(messages, **kwargs)
+
+    @property
+    def capabilities(self):
+        return self.client.capabilities
+
+    @property
+    def model_info(self):
+        return self.client.model_info
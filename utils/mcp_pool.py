@@ -0,0 +1,112 @@
+import asyncio
+import os
+import shutil
+import time
+from autogen_ext.tools.mcp import McpWorkbench, StdioServerParams
+
+# SQLite MCP Server 可执行文件，可通过环境变量 MCP_SERVER_SQLITE 指定
+MCP_SERVER_SQLITE = os.environ.get("MCP_SERVER_SQLITE") or shutil.which("mcp-server-sqlite") or "mcp-server-sqlite"
+# 距上次成功检查超过该时间（秒）才重新做健康检查
+HEALTH_CHECK_INTERVAL = 30
+# 健康检查的超时时间（秒）
+HEALTH_CHECK_TIMEOUT = 10
+
+
+class WorkbenchPool:
+    def __init__(self, health_check_interval: float = HEALTH_CHECK_INTERVAL, health_check_timeout: float = HEALTH_CHECK_TIMEOUT):
+        """
+        进程内共享的MCP工作台池
+
+        每个键（如数据库路径）对应一个常驻的MCP服务器子进程，多次请求复用同一个工作台，
+        取用时通过 list_tools 做健康检查，失效的工作台会被关闭并重新启动
+
+        参数:
+            health_check_interval (float): 两次健康检查的最小间隔（秒）
+            health_check_timeout (float): 健康检查超时时间（秒）
+        """
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        # {key: {"workbench", "loop", "checked_at"}}
+        self._entries = {}
+        # {key: (loop, asyncio.Lock)}
+        self._locks = {}
+
+    def _lock(self, key: str, loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+        """每个键一把锁，避免并发请求重复启动同一个服务器；锁只在创建它的事件循环中使用"""
+        lock_loop, lock = self._locks.get(key, (None, None))
+        if lock_loop is not loop:
+            lock = asyncio.Lock()
+            self._locks[key] = (loop, lock)
+        return lock
+
+    async def _healthy(self, entry: dict) -> bool:
+        if time.monotonic() - entry["checked_at"] < self.health_check_interval:
+            return True
+        try:
+            await asyncio.wait_for(entry["workbench"].list_tools(), self.health_check_timeout)
+        except Exception as e:
+            print(f"MCP工作台健康检查失败: {e}")
+            return False
+        entry["checked_at"] = time.monotonic()
+        return True
+
+    async def _stop(self, entry: dict):
+        try:
+            await entry["workbench"].stop()
+        except Exception as e:
+            print(f"关闭MCP工作台失败: {e}")
+
+    async def get(self, key: str, server_params: StdioServerParams) -> McpWorkbench:
+        """
+        获取键对应的工作台，不存在或已失效时启动新的MCP服务器
+
+        返回的工作台由池管理，调用方不需要也不应该关闭它
+        """
+        loop = asyncio.get_running_loop()
+        async with self._lock(key, loop):
+            entry = self._entries.get(key)
+            if entry is not None and entry["loop"] is not loop:
+                # 创建工作台的事件循环已经结束（如多次 asyncio.run），旧工作台无法继续使用
+                self._entries.pop(key)
+                entry = None
+
+            if entry is not None and not await self._healthy(entry):
+                self._entries.pop(key)
+                await self._stop(entry)
+                entry = None
+
+            if entry is None:
+                print(f"启动MCP Server... ({key})")
+                workbench = McpWorkbench(server_params=server_params)
+                await workbench.start()
+                entry = {"workbench": workbench, "loop": loop, "checked_at": time.monotonic()}
+                self._entries[key] = entry
+
+            return entry["workbench"]
+
+    async def close(self):
+        """关闭当前事件循环中启动的所有工作台"""
+        loop = asyncio.get_running_loop()
+        for key, entry in list(self._entries.items()):
+            if entry["loop"] is loop:
+                self._entries.pop(key)
+                await self._stop(entry)
+
+
+_pool = WorkbenchPool()
+
+
+async def get_sqlite_workbench(db_path: str) -> McpWorkbench:
+    """获取指定SQLite数据库的共享MCP工作台"""
+    db_path = os.path.abspath(db_path)
+    server_params = StdioServerParams(
+        command=MCP_SERVER_SQLITE,
+        args=["--db-path", db_path],
+        read_timeout_seconds=60,
+    )
+    return await _pool.get(db_path, server_params)
+
+
+async def close_workbenches():
+    """关闭共享池中的工作台，在程序退出前调用"""
+    await _pool.close()
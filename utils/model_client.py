@@ -0,0 +1,257 @@
+import asyncio
+import os
+import time
+import threading
+import weakref
+import httpx
+from autogen_core.models import ChatCompletionClient, RequestUsage
+from autogen_ext.models.openai import OpenAIChatCompletionClient
+from utils.llm_cache import CachedModelClient
+
+# 各模型的连接参数，api_key 从对应的环境变量读取
+MODEL_CONFIGS = {
+    "deepseek-chat": {
+        "base_url": "https://api.deepseek.com",
+        "api_key_env": "DEEPSEEK_API_KEY",
+        "model_info": {
+            "vision": False,
+            "function_calling": True,
+            "json_output": True,
+            "family": "unknown",
+        },
+        # 同时进行的请求数上限
+        "concurrency": int(os.environ.get("DEEPSEEK_CONCURRENCY", 8)),
+    },
+}
+
+# HTTP连接池大小和请求超时（秒）
+POOL_MAX_CONNECTIONS = 32
+POOL_MAX_KEEPALIVE = 16
+REQUEST_TIMEOUT = 120
+
+
+class ModelMetrics:
+    def __init__(self, model: str):
+        """单个模型的请求计时和用量统计，同一模型的所有调用方共享"""
+        self.model = model
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.wait_seconds = 0.0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.first_token_seconds = 0.0
+        self.streams = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def record(self, wait: float, elapsed: float, usage: RequestUsage = None, error: bool = False, first_token: float = None):
+        """
+        记录一次请求
+
+        参数:
+            wait (float): 等待并发名额的时间（秒）
+            elapsed (float): 从发出请求到收到完整响应的时间（秒）
+            usage (RequestUsage, optional): 本次请求的token用量
+            error (bool): 请求是否失败
+            first_token (float, optional): 流式请求收到第一个片段的时间（秒）
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.errors += int(error)
+            self.wait_seconds += wait
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            if first_token is not None:
+                self.streams += 1
+                self.first_token_seconds += first_token
+            if usage is not None:
+                self.prompt_tokens += usage.prompt_tokens
+                self.completion_tokens += usage.completion_tokens
+
+    def snapshot(self) -> dict:
+        """返回当前统计结果"""
+        with self._lock:
+            return {
+                "model": self.model,
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "avg_wait_seconds": round(self.wait_seconds / self.requests, 3) if self.requests else 0.0,
+                "avg_seconds": round(self.total_seconds / self.requests, 3) if self.requests else 0.0,
+                "max_seconds": round(self.max_seconds, 3),
+                "avg_first_token_seconds": round(self.first_token_seconds / self.streams, 3) if self.streams else None,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+
+class PooledModelClient(ChatCompletionClient):
+    def __init__(self, model: str, model_info: dict = None):
+        """
+        进程内共享的模型客户端
+
+        每个事件循环各持有一个底层 OpenAIChatCompletionClient 和HTTP连接池，
+        同一事件循环中的所有智能体复用连接，并记录排队时间、响应时间和token用量
+
+        并发上限按事件循环计算：每个事件循环各有一个容量为模型 concurrency 的信号量，
+        不跨事件循环共享。脚本通常只用 asyncio.run 运行一个事件循环，此时就是进程内的上限；
+        多个线程各自运行事件循环时，总并发最多为 concurrency 乘以事件循环数
+
+        close() 不会关闭共享连接，程序退出前调用 close_model_clients()
+
+        参数:
+            model (str): MODEL_CONFIGS 中的模型名
+            model_info (dict, optional): 覆盖默认的 model_info 字段
+        """
+        if model not in MODEL_CONFIGS:
+            raise ValueError(f"未配置的模型: {model}")
+        self.model = model
+        self.config = MODEL_CONFIGS[model]
+        self._model_info = {**self.config["model_info"], **(model_info or {})}
+        self.metrics = _metrics.setdefault(model, ModelMetrics(model))
+        # {事件循环: (底层客户端, 该事件循环的并发信号量)}，事件循环结束后自动释放
+        self._states = weakref.WeakKeyDictionary()
+        self._usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+        self._last_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
+
+    def _state(self) -> tuple:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=POOL_MAX_CONNECTIONS, max_keepalive_connections=POOL_MAX_KEEPALIVE),
+                timeout=REQUEST_TIMEOUT,
+            )
+            client = OpenAIChatCompletionClient(
+                model=self.model,
+                base_url=self.config["base_url"],
+                api_key=os.environ.get(self.config["api_key_env"]),
+                model_info=self._model_info,
+                http_client=http_client,
+            )
+            state = (client, asyncio.Semaphore(self.config["concurrency"]))
+            self._states[loop] = state
+        return state
+
+    def _add_usage(self, usage: RequestUsage):
+        self._last_usage = usage
+        self._usage = RequestUsage(
+            prompt_tokens=self._usage.prompt_tokens + usage.prompt_tokens,
+            completion_tokens=self._usage.completion_tokens + usage.completion_tokens,
+        )
+
+    async def create(self, messages, **kwargs):
+        client, semaphore = self._state()
+        queued = time.perf_counter()
+        async with semaphore:
+            started = time.perf_counter()
+            self.metrics.start()
+            try:
+                result = await client.create(messages, **kwargs)
+            except BaseException:
+                self.metrics.record(started - queued, time.perf_counter() - started, error=True)
+                raise
+        self.metrics.record(started - queued, time.perf_counter() - started, usage=result.usage)
+        self._add_usage(result.usage)
+        return result
+
+    async def create_stream(self, messages, **kwargs):
+        client, semaphore = self._state()
+        queued = time.perf_counter()
+        async with semaphore:
+            started = time.perf_counter()
+            first_token = None
+            usage = None
+            self.metrics.start()
+            try:
+                async for chunk in client.create_stream(messages, **kwargs):
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    if not isinstance(chunk, str):
+                        usage = chunk.usage
+                    yield chunk
+            except BaseException:
+                self.metrics.record(started - queued, time.perf_counter() - started, error=True, first_token=first_token)
+                raise
+        self.metrics.record(started - queued, time.perf_counter() - started, usage=usage, first_token=first_token)
+        if usage is not None:
+            self._add_usage(usage)
+
+    async def close(self):
+        """共享客户端由 close_model_clients() 统一关闭，这里不做任何事"""
+
+    async def aclose(self):
+        """关闭当前事件循环中的底层客户端"""
+        loop = asyncio.get_running_loop()
+        state = self._states.pop(loop, None)
+        if state is not None:
+            await state[0].close()
+
+    def actual_usage(self) -> RequestUsage:
+        return self._last_usage
+
+    def total_usage(self) -> RequestUsage:
+        return self._usage
+
+    def count_tokens(self, messages, **kwargs) -> int:
+        return self._state()[0].count_tokens(messages, **kwargs)
+
+    def remaining_tokens(self, messages, **kwargs) -> int:
+        return self._state()[0].remaining_tokens(messages, **kwargs)
+
+    @property
+    def capabilities(self):
+        return self._model_info
+
+    @property
+    def model_info(self):
+        return self._model_info
+
+
+# {模型名: ModelMetrics}
+_metrics = {}
+# {(模型名, 是否缓存, model_info覆盖项): 客户端}
+_clients = {}
+_clients_guard = threading.Lock()
+
+
+def get_model_client(model: str = "deepseek-chat", cache: bool = False, **model_info) -> ChatCompletionClient:
+    """
+    获取共享的模型客户端，同一模型和 model_info 只创建一个实例
+
+    参数:
+        model (str): 模型名，默认 deepseek-chat
+        cache (bool): 是否使用响应缓存，内容相同的请求直接返回缓存结果，适合可重复的分析任务
+        **model_info: 覆盖默认 model_info 的字段，如 multiple_system_messages=True
+
+    返回:
+        ChatCompletionClient: 可直接传给 AssistantAgent 等智能体的 model_client
+    """
+    key = (model, cache, tuple(sorted(model_info.items())))
+    with _clients_guard:
+        if key not in _clients:
+            base_key = (model, False, key[2])
+            if base_key not in _clients:
+                _clients[base_key] = PooledModelClient(model, model_info)
+            if cache:
+                _clients[key] = CachedModelClient(_clients[base_key], model=model)
+        return _clients[key]
+
+
+def get_model_metrics() -> dict:
+    """返回所有模型的请求统计 {模型名: 统计结果}"""
+    return {model: metrics.snapshot() for model, metrics in _metrics.items()}
+
+
+async def close_model_clients():
+    """关闭当前事件循环中所有共享客户端的连接，在程序退出前调用"""
+    for client in list(_clients.values()):
+        if isinstance(client, PooledModelClient):
+            await client.aclose()
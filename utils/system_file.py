@@ -1,116 +1,132 @@
-import asyncio
 import json
 import os
-from autogen_agentchat.agents import AssistantAgent
-from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_agentchat.conditions import TextMentionTermination, MaxMessageTermination
-from autogen_agentchat.ui import Console
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_ext.tools.mcp import StdioServerParams, mcp_server_tools
-from autogen_ext.tools.mcp import McpWorkbench, StdioServerParams
-
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY") 
-
-SERP_API_KEY = "b155eb94ad29e4c2cc927910428134add56f644c578cd4eebe86b38649274f7b"  # 这里需要替换为你有效的SERP API密钥
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+import hashlib
+import datetime
+import tempfile
+import threading
+from contextlib import contextmanager
+
+# Windows 下没有fcntl，只使用进程内的锁
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 默认的新闻数据目录
+NEWS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "database", "news")
+# 每个目录下的只追加索引文件
+INDEX_NAME = "index.jsonl"
 
+# {文件路径: 可重入锁}
+_locks = {}
+# {文件路径: 当前持有线程的加锁层数}，只由持有锁的线程读写
+_depths = {}
+_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    对指定文件加锁，同一进程内的线程和不同进程之间都互斥
 
-async def file_writer(task : str, dir : str) -> None:
+    锁文件为 <path>.lock，不会修改被保护的文件本身；
+    同一线程可以嵌套加锁，只有最外层会对锁文件加 flock
+    """
+    path = os.path.abspath(path)
+    with _locks_guard:
+        thread_lock = _locks.setdefault(path, threading.RLock())
+
+    with thread_lock:
+        depth = _depths.get(path, 0)
+        _depths[path] = depth + 1
+        try:
+            if depth or fcntl is None:
+                yield
+                return
+            with open(f"{path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            _depths[path] = depth
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """先写入同目录下的临时文件再重命名，读取方不会看到写了一半的文件"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-    # 设置MCP fetch服务器参数
-    server_params = StdioServerParams(
-        command="npx", 
-        args=["-y", "@modelcontextprotocol/server-filesystem", dir], 
-        read_timeout_seconds=10
-    )
 
-    # 从MCP服务器获取filesystem工具
-    tools_write = await mcp_server_tools(server_params)
-    
+def _serialize(content) -> tuple:
+    """将内容转换为文本，返回 (文本, 扩展名)；字典和列表以及合法的JSON字符串保存为json"""
+    if isinstance(content, (dict, list)):
+        return json.dumps(content, ensure_ascii=False, indent=2), "json"
     try:
+        json.loads(content)
+        return content, "json"
+    except (TypeError, ValueError):
+        return str(content), "txt"
 
-        async with McpWorkbench(server_params=server_params) as workbench:
-            # 检查服务器是否成功连接
-            print("MCP Workbench已启动，检查可用工具...")
-            tools = await workbench.list_tools()
-            print(f"可用工具列表: {tools}")
-            
-            # 创建文件写入助手
-            file_writer_agent = AssistantAgent(
-                name="file_writer",
-                model_client=model_client,
-                workbench=workbench,
-                system_message="""你是一个文件助手，负责将给定内容以json格式写入到本地文件。
-                你的任务是使用文件系统工具将内容写入到指定的文件中。文件名根据内容进行概括
-                成功写入后，回复"TERMINATE"以结束对话。"""
-            )
-            
-            # 创建终止条件
-            termination = TextMentionTermination("TERMINATE", sources=["file_writer"])
-
-            # 创建RoundRobinGroupChat团队
-            team = RoundRobinGroupChat(
-                participants=[file_writer_agent],
-                termination_condition=termination,
-            )
-
-            await Console(team.run_stream(task=task))
-            print("\n新闻数据已成功写入文件。")
-            
-    finally:
-        # 关闭模型客户端资源
-        await model_client.close()
-
-if __name__ == "__main__":
-    task =  """
-   {
-    "news": [
-        {
-            "title": "“对等关税”政策刚满月 美国人从头到脚受打击",
-            "link": "https://www.yzwb.net/zncontent/4483456.html",
-            "source": "紫牛新闻",
-            "date": "05/03/2025, 04:41 AM, +0000 UTC"
-        },
-        {
-            "title": "对华小额包裹免税取消=更高价格+更慢物流，美消费者为关税政策买单",
-            "link": "https://www.thepaper.cn/newsDetail_forward_30764073?commTag=true",
-            "source": "澎湃新闻",
-            "date": "05/03/2025, 03:06 AM, +0000 UTC"
-        },
-        {
-            "title": "对华小额包裹免税取消=更高价格+更慢物流 美消费者为关税政策买单",
-            "link": "https://www.chinanews.com.cn/gj/2025/05-03/10410003.shtml",
-            "source": "chinanews.com.cn",
-            "date": "05/03/2025, 02:16 AM, +0000 UTC"
-        },
-        {
-            "title": "关税大棒砸到美发业 美国“头等大事”变“头顶危机”",
-            "link": "http://news.cnhubei.com/content/2025-05/03/content_19149890.html",
-            "source": "荆楚网",
-            "date": "05/03/2025, 01:54 AM, +0000 UTC"
-        },
-        {
-            "title": "特朗普关税满月，美多地爆发抗议！耐克、阿迪达斯等巨头：已构成“生存威胁”，关税将致许多企业不得不倒闭！昨夜，中国资产大爆发",
-            "link": "https://news.sina.cn/gj/2025-05-03/detail-inevfwne4083251.d.html",
-            "source": "新浪新闻_手机新浪网",
-            "date": "05/03/2025, 01:54 AM, +0000 UTC"
-        }
-    ]
-}
-
-TERMINATE
+
+def save_document(content, dir: str = NEWS_DIR, kind: str = "document", title: str = None, metadata: dict = None) -> dict:
+    """
+    保存文档，文件名由内容哈希生成，相同内容只保存一次
+
+    文件写入和索引追加在同一把锁内完成，多个线程或进程并发写入同一目录是安全的
+
+    参数:
+        content: 文档内容，可以是字符串、字典或列表
+        dir (str): 保存目录，默认为 database/news
+        kind (str): 文档类型，作为文件名前缀，例如 news、analysis
+        title (str, optional): 文档标题，记录在索引中
+        metadata (dict, optional): 额外记录在索引中的信息
+
+    返回:
+        dict: 索引条目 {"file", "sha256", "kind", "title", "size", "created_at", "created", ...}，
+              created为False表示相同内容已经存在
     """
-    dir = "/Users/xueyicheng/Documents/SRTP/autogen/autogen_mcp/database/news"
-    asyncio.run(file_writer(task, dir))
+    text, extension = _serialize(content)
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    file_name = f"{kind}_{digest[:16]}.{extension}"
+    path = os.path.join(dir, file_name)
+
+    entry = {
+        "file": file_name,
+        "sha256": digest,
+        "kind": kind,
+        "title": title,
+        "size": len(data),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        **(metadata or {}),
+    }
+
+    os.makedirs(dir, exist_ok=True)
+    index_path = os.path.join(dir, INDEX_NAME)
+    with file_lock(index_path):
+        created = not os.path.exists(path)
+        if created:
+            atomic_write(path, data)
+            with open(index_path, "a", encoding="utf-8") as index_file:
+                index_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    return {**entry, "created": created}
+
 
+def read_index(dir: str = NEWS_DIR) -> list:
+    """读取目录下的索引，按写入顺序返回所有条目"""
+    index_path = os.path.join(dir, INDEX_NAME)
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
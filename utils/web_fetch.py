@@ -1,8 +1,170 @@
+import os
+import time
+import asyncio
+import hashlib
+import threading
 import requests
-from requests.exceptions import RequestException
-from typing import Optional, Dict, Any, Tuple
+import diskcache
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from requests.exceptions import RequestException, Timeout
+from typing import Optional, Dict, Any, Tuple, List
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
+# 安装了lxml时使用C实现的解析器，否则使用标准库的html.parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# 默认请求头
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
+}
+
+# 网页缓存目录，可通过环境变量 WEB_FETCH_CACHE_DIR 修改
+CACHE_DIR = os.environ.get(
+    "WEB_FETCH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "web_fetch")
+)
+# 在此时间内直接使用缓存的页面，超过后用ETag/Last-Modified向服务器验证
+CACHE_FRESH_SECONDS = 3600
+# 缓存条目的最长保留时间
+CACHE_EXPIRE_SECONDS = 7 * 24 * 3600
+# 缓存总大小上限，超出后淘汰最近最少使用的条目
+CACHE_SIZE_LIMIT = 512 * 1024 * 1024
+# 连接池中每个主机保持的最大连接数
+POOL_MAXSIZE = 16
+# 批量抓取时的最大总并发数和每个主机的最大并发数
+MAX_CONCURRENCY = 16
+PER_HOST_LIMIT = 4
+# 读取响应正文时每次读取的字节数
+READ_CHUNK_SIZE = 64 * 1024
+# fetch_text_from_url 返回的错误信息前缀
+ERROR_PREFIXES = ("请求错误:", "解析HTML失败:", "未知错误:")
+
+_session = None
+_cache = None
+_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """获取共享的HTTP会话，所有请求复用同一个连接池和keep-alive连接"""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+def get_cache() -> diskcache.Cache:
+    """获取磁盘网页缓存"""
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = diskcache.Cache(
+                CACHE_DIR,
+                size_limit=CACHE_SIZE_LIMIT,
+                eviction_policy='least-recently-used'
+            )
+    return _cache
+
+def _headers_digest(headers: Dict[str, str]) -> str:
+    """请求头的摘要，头名称不区分大小写；认证等敏感信息不会以明文写入缓存"""
+    normalized = sorted((name.lower(), str(value).strip()) for name, value in headers.items())
+    return hashlib.sha256(repr(normalized).encode('utf-8')).hexdigest()
+
+def _read_body(response: requests.Response, deadline: float) -> str:
+    """
+    分块读取响应正文，超过截止时间时抛出Timeout
+
+    requests的timeout只限制连接和单次读取的等待时间，服务器持续缓慢发送数据时
+    整个请求可能远超timeout，这里额外限制读取正文的总时间
+    """
+    chunks = []
+    for chunk in response.iter_content(READ_CHUNK_SIZE):
+        chunks.append(chunk)
+        if time.monotonic() > deadline:
+            raise Timeout(f"读取响应超过截止时间: {response.url}")
+    data = b''.join(chunks)
+    # 与 response.text 相同：优先使用响应头声明的编码，否则根据内容猜测
+    encoding = response.encoding or chardet.detect(data)['encoding'] or 'utf-8'
+    return data.decode(encoding, errors='replace')
+
+def _download(url: str, headers: Dict[str, str], timeout: int, verify_ssl: bool) -> Dict[str, Any]:
+    """
+    获取页面HTML，优先使用缓存
+
+    缓存按URL和请求头区分，不同请求头（如Accept-Language、认证信息）的响应分别缓存；
+    缓存未过期时不发请求；过期后携带If-None-Match/If-Modified-Since发送条件请求，
+    服务器返回304时继续使用缓存内容；连接和读取正文的总时间不超过timeout
+
+    返回:
+        dict: 包含 html、digest、etag、last_modified、checked_at 的缓存条目
+    """
+    cache = get_cache()
+    key = ('page', url, _headers_digest(headers))
+    entry = cache.get(key)
+    now = time.time()
+    if entry and now - entry['checked_at'] < CACHE_FRESH_SECONDS:
+        return entry
+
+    request_headers = dict(headers)
+    if entry:
+        if entry.get('etag'):
+            request_headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            request_headers['If-Modified-Since'] = entry['last_modified']
+
+    deadline = time.monotonic() + timeout
+    with get_session().get(url, headers=request_headers, timeout=timeout, verify=verify_ssl, stream=True) as response:
+        if entry and response.status_code == 304:
+            entry['checked_at'] = now
+        else:
+            response.raise_for_status()
+            html_content = _read_body(response, deadline)
+            entry = {
+                'html': html_content,
+                'digest': hashlib.sha256(html_content.encode('utf-8')).hexdigest(),
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'checked_at': now
+            }
+    cache.set(key, entry, expire=CACHE_EXPIRE_SECONDS)
+    return entry
+
+def _extract_text(html_content: str, target_selector: Optional[str] = None) -> str:
+    """从HTML中提取正文文本"""
+    # 使用BeautifulSoup解析HTML
+    soup = BeautifulSoup(html_content, HTML_PARSER)
+    
+    # 如果提供了选择器，则只提取选择器匹配的内容
+    if target_selector:
+        target_elements = soup.select(target_selector)
+        if target_elements:
+            # 创建新的BeautifulSoup对象只包含目标元素
+            soup = BeautifulSoup('', HTML_PARSER)
+            for element in target_elements:
+                soup.append(element)
+    
+    # 移除脚本和样式元素
+    for script_or_style in soup(['script', 'style', 'head', 'title', 'meta', '[document]', 'footer', 'header', 'nav']):
+        script_or_style.decompose()
+        
+    # 提取所有文本
+    text = soup.get_text()
+    
+    # 处理文本，清理多余空白
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
 def fetch_text_from_url(url: str, 
                        target_selector: Optional[str] = None,
                        headers: Optional[Dict[str, str]] = None, 
@@ -16,62 +178,28 @@ def fetch_text_from_url(url: str,
         url (str): 要获取内容的网页URL
         target_selector (str, optional): 目标内容的CSS选择器，如果提供，将只提取该选择器匹配的内容
         headers (dict, optional): 请求头信息，默认为模拟常规浏览器
-        timeout (int): 请求超时时间（秒），默认30秒
+        timeout (int): 请求超时时间（秒），默认30秒，包括连接和读取正文的总时间
         verify_ssl (bool): 是否验证SSL证书，默认为True
         maxlen (int): 提取文本的最大长度，默认1000000字符，请不要超过模型最大token数的2/3
         
     返回:
         str: 提取的文本内容或错误信息
     """
-    # 默认请求头
-    default_headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
-    }
-    
     # 使用提供的请求头或默认请求头
-    request_headers = headers if headers else default_headers
+    request_headers = headers if headers else DEFAULT_HEADERS
     
     try:
-        # 发送GET请求
-        response = requests.get(
-            url, 
-            headers=request_headers, 
-            timeout=timeout,
-            verify=verify_ssl
-        )
-        
-        # 检查响应状态码
-        response.raise_for_status()
-        
-        # 获取HTML内容
-        html_content = response.text
+        # 获取HTML内容，未变化的页面直接使用缓存
+        entry = _download(url, request_headers, timeout, verify_ssl)
         
         try:
-            # 使用BeautifulSoup解析HTML
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 如果提供了选择器，则只提取选择器匹配的内容
-            if target_selector:
-                target_elements = soup.select(target_selector)
-                if target_elements:
-                    # 创建新的BeautifulSoup对象只包含目标元素
-                    soup = BeautifulSoup('', 'html.parser')
-                    for element in target_elements:
-                        soup.append(element)
-            
-            # 移除脚本和样式元素
-            for script_or_style in soup(['script', 'style', 'head', 'title', 'meta', '[document]', 'footer', 'header', 'nav']):
-                script_or_style.decompose()
-                
-            # 提取所有文本
-            text = soup.get_text()
-            
-            # 处理文本，清理多余空白
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+            # 同一页面内容和选择器的提取结果也会缓存，避免重复解析
+            cache = get_cache()
+            text_key = ('text', entry['digest'], target_selector, HTML_PARSER)
+            text = cache.get(text_key)
+            if text is None:
+                text = _extract_text(entry['html'], target_selector)
+                cache.set(text_key, text, expire=CACHE_EXPIRE_SECONDS)
             
             return text[:maxlen]
             
@@ -84,6 +212,44 @@ def fetch_text_from_url(url: str,
         return f"未知错误: {str(e)}"
 
 
+async def fetch_many(urls: List[str],
+                     target_selector: Optional[str] = None,
+                     timeout: int = 30,
+                     per_host: int = PER_HOST_LIMIT,
+                     maxlen: int = 1000000) -> Dict[str, Dict[str, Any]]:
+    """
+    并发获取多个URL的文本内容，一次调用代替逐个调用fetch_text_from_url
+    
+    参数:
+        urls (list): 要获取内容的网页URL列表，重复的URL只请求一次
+        target_selector (str, optional): 目标内容的CSS选择器，对所有URL生效
+        timeout (int): 单个URL的超时时间（秒），默认30秒
+        per_host (int): 同一网站的最大并发请求数，默认4
+        maxlen (int): 每篇文本的最大长度，默认1000000字符
+        
+    返回:
+        dict: 以URL为键的结果，成功时为 {"ok": True, "text": 提取的文本, "elapsed": 耗时秒数}，
+              失败时为 {"ok": False, "error": 错误信息, "elapsed": 耗时秒数}
+    """
+    total_limit = asyncio.Semaphore(MAX_CONCURRENCY)
+    host_limits = {}
+    
+    async def fetch_one(url):
+        host_limit = host_limits.setdefault(urlparse(url).netloc, asyncio.Semaphore(per_host))
+        async with host_limit, total_limit:
+            started = time.perf_counter()
+            # 超时在 fetch_text_from_url 内部处理，线程会在截止时间后结束，不会在后台继续占用线程池
+            text = await asyncio.to_thread(fetch_text_from_url, url, target_selector, None, timeout, True, maxlen)
+            elapsed = round(time.perf_counter() - started, 3)
+        
+        if text.startswith(ERROR_PREFIXES):
+            return url, {"ok": False, "error": text, "elapsed": elapsed}
+        return url, {"ok": True, "text": text, "elapsed": elapsed}
+    
+    results = await asyncio.gather(*(fetch_one(url) for url in dict.fromkeys(urls)))
+    return dict(results)
+
+
 # 使用示例
 if __name__ == "__main__":
     url = "https://edition.cnn.com/2025/05/02/australia/polling-young-voters-australia-election-intl-hnk"
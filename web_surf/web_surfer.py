@@ -2,26 +2,14 @@ import asyncio
 import os
 from autogen_agentchat.ui import Console
 from autogen_agentchat.teams import RoundRobinGroupChat
-from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_ext.agents.web_surfer import MultimodalWebSurfer
 from utils.Console_with_history import Console_with_history
 from autogen_agentchat.conditions import MaxMessageTermination, TextMentionTermination
 from autogen_agentchat.tools import AgentTool
 from autogen_agentchat.agents import AssistantAgent
+from utils.model_client import get_model_client
 
-DEEPSEEK_API_KEY = os.environ.get("DEEPSEEK_API_KEY")
-
-model_client = OpenAIChatCompletionClient(
-    model="deepseek-chat", 
-    base_url="https://api.deepseek.com",
-    api_key=DEEPSEEK_API_KEY, 
-    model_info={
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "family": "unknown",
-    }
-)
+model_client = get_model_client()
 
 async def web_surfer() -> None:
     web_surfer = MultimodalWebSurfer(